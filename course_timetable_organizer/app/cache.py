@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    job_id: str
+    result: Dict[str, Any]
+    history: List[Any]
+
+
+def instance_digest(path: str) -> str:
+    """Content hash of an instance file, insensitive to key order and whitespace."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    canon = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+
+def result_key(digest: str, cfg: Dict[str, Any], version: int) -> str:
+    canon = json.dumps({"instance": digest, "cfg": cfg, "version": version},
+                       sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Finished job results by key, least recently used evicted first, plus
+    the keys whose job is still running so duplicates can attach to it.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0.")
+        self.max_entries = max_entries
+        self._done: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._running: Dict[str, str] = {}
+        self._lock = Lock()
+
+    def claim(self, key: str, job_id: str) -> Tuple[Optional[CachedResult], Optional[str]]:
+        """
+        Returns (cached result, None) on a hit, (None, running job id) when
+        an identical job is in flight, else registers `job_id` as the one
+        computing `key` and returns (None, None).
+        """
+        with self._lock:
+            hit = self._done.get(key)
+            if hit is not None:
+                self._done.move_to_end(key)
+                return hit, None
+            running = self._running.get(key)
+            if running is not None:
+                return None, running
+            self._running[key] = job_id
+            return None, None
+
+    def finish(self, key: str, job_id: str, result: Dict[str, Any], history: List[Any]) -> None:
+        with self._lock:
+            if self._running.get(key) == job_id:
+                del self._running[key]
+            self._done[key] = CachedResult(job_id=job_id, result=result, history=history)
+            self._done.move_to_end(key)
+            while len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+
+    def abandon(self, key: str, job_id: str) -> None:
+        with self._lock:
+            if self._running.get(key) == job_id:
+                del self._running[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._done)
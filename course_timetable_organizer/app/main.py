@@ -2,22 +2,79 @@ from __future__ import annotations
 
 import json
 import os
+import random
 import threading
 import time
 import uuid
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field, replace
 from typing import Any, Dict, List, Optional, Tuple
 from threading import Lock
 
 from fastapi import APIRouter, FastAPI, File, Form, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.cache import ResultCache, instance_digest, result_key
+from app.runner import SolveSpec, SolverProcess, stop_all
 from timetable.fitness import evaluate
-from timetable.ga import GAConfig, solve
+from timetable.ga import GAConfig, check_config
+from timetable.kernels import resolve as resolve_kernels
 from timetable.loader import load_instance
+from timetable.localsearch import LSConfig
+from timetable.population import BestSnapshot
+from timetable.portfolio import Member, engine_of
+from timetable.preflight import preflight
+from timetable.sweep import check_sweep, expand_grid
+from timetable.warmstart import assignments_from_rows, warm_start_individual
 
 HistoryRow = Tuple[int, int, int, int]
 
+# API form names -> GAConfig fields
+_CFG_FIELDS = {
+    "pop": "pop_size",
+    "gen": "generations",
+    "seed": "seed",
+    "repair": "use_repair",
+    "log_every": "log_every",
+    "workers": "workers",
+    "repair_attempts_per_gene": "repair_attempts_per_gene",
+    "repair_max_rounds": "repair_max_rounds",
+    "room_mode": "room_mode",
+    "init_constructive": "init_constructive",
+    "repair_mode": "repair_mode",
+    "repair_tracker": "repair_tracker",
+    "memetic_every": "memetic_every",
+    "memetic_top_k": "memetic_top_k",
+    "memetic_moves": "memetic_moves",
+    "memetic_ms": "memetic_ms",
+    "delta_eval": "delta_eval",
+    "breeding": "breeding",
+    "symmetry": "symmetry",
+    "fitness_cache": "fitness_cache",
+    "adaptive": "adaptive",
+    "crossover": "crossover",
+    "kernels": "kernels",
+}
+
+# bump whenever a solver change alters the result for the same seed, so
+# cached results from older code are not served
+SOLVER_VERSION = 8
+
+ENGINES = ("ga", "ls", "portfolio")
+
+# timetable.remote broker for jobs submitted with remote=true; server-side
+# only, since the API unpickles whatever the broker sends back
+REMOTE_BROKER = os.environ.get("TIMETABLE_BROKER", "")
+MEMBER_ENGINES = ("ga", "ls")
+
+# raced when a portfolio job does not list its own members
+DEFAULT_PORTFOLIO: List[Dict[str, Any]] = [
+    {"engine": "ga"},
+    {"engine": "ga", "init_constructive": 0.5, "repair_mode": "best"},
+    {"engine": "ls"},
+    {"engine": "ga", "repair": False, "room_mode": "matching", "memetic_every": 5},
+]
+
 
 @dataclass
 class InstanceRecord:
@@ -25,6 +82,8 @@ class InstanceRecord:
     path: str
     name: str
     created_at: float
+    digest: str
+    preflight: Optional[Dict[str, Any]] = None  # computed on first use
 
 
 @dataclass
@@ -41,6 +100,13 @@ class Job:
     instance_id: str
     instance_name: str
     lock: Lock
+    cache_key: Optional[str] = None
+    cached_from: Optional[str] = None  # job whose result was reused
+    operator_history: List[Dict[str, Any]] = field(default_factory=list)  # adaptive GA decisions
+    preflight: Optional[Dict[str, Any]] = None
+    best: Optional[BestSnapshot] = None  # live incumbent while running
+    best_view: Optional[Tuple[int, Dict[str, Any]]] = None  # (snapshot version, rendered view)
+    kernels: Optional[str] = None  # evaluation backend the run resolved to
 
 
 RUNS_DIR = ".runs"
@@ -49,8 +115,17 @@ os.makedirs(INST_DIR, exist_ok=True)
 
 INSTANCES: Dict[str, InstanceRecord] = {}
 JOBS: Dict[str, Job] = {}
+SWEEPS: Dict[str, Job] = {}
+RESULTS = ResultCache(max_entries=64)
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    yield
+    stop_all()  # solver processes are not daemonic; do not outlive the API
 
-app = FastAPI(title="Timetable Solver API", version="1.1")
+
+app = FastAPI(title="Timetable Solver API", version="1.1", lifespan=_lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -77,6 +152,10 @@ def _job_view(j: Job) -> Dict[str, Any]:
             "instance_id": j.instance_id,
             "instance_name": j.instance_name,
             "has_result": j.result is not None,
+            "cached_from": j.cached_from,
+            "operator_history": j.operator_history,
+            "preflight": j.preflight,
+            "kernels": j.kernels,
         }
 
 
@@ -302,6 +381,108 @@ def _save_uploaded_json(file: UploadFile) -> Tuple[str, str, str]:
     return inst_id, name, path
 
 
+def _checked(key: str, value: Any, default: Any) -> Any:
+    # JSON configs (sweep variants, portfolio members) are not coerced:
+    # "false" is not a bool and 0.5 is not an int
+    kind = type(default)
+    if kind is bool:
+        ok = isinstance(value, bool)
+    elif kind in (int, float):
+        ok = isinstance(value, int if kind is int else (int, float)) and not isinstance(value, bool)
+    else:
+        ok = isinstance(value, kind)
+    if not ok:
+        raise ValueError(f"{key} must be {kind.__name__}, got {value!r}")
+    return kind(value)
+
+
+def _ga_config(cfg: Dict[str, Any]) -> GAConfig:
+    defaults = GAConfig()
+    kwargs: Dict[str, Any] = {}
+    for key, field in _CFG_FIELDS.items():
+        if key in cfg:
+            kwargs[field] = _checked(key, cfg[key], getattr(defaults, field))
+    return GAConfig(**kwargs)
+
+
+def _member_config(cfg: Dict[str, Any]) -> Member:
+    ga_cfg = _ga_config(cfg)
+    if cfg.get("engine", "ga") == "ls":
+        return LSConfig.from_ga(ga_cfg, moves_per_epoch=_checked("ls_moves", cfg["ls_moves"], 0))
+    return ga_cfg
+
+
+def _resolve_instance(instance_id: str, instance: Optional[UploadFile]) -> Tuple[str, str]:
+    inst_id = instance_id.strip()
+
+    if inst_id:
+        if inst_id not in INSTANCES:
+            raise HTTPException(
+                status_code=404, detail="instance_id not found")
+        return inst_id, INSTANCES[inst_id].name
+
+    if instance is None:
+        raise HTTPException(
+            status_code=400, detail="Provide instance_id or upload instance file")
+
+    new_id, name, path = _save_uploaded_json(instance)
+    load_instance(path)
+    INSTANCES[new_id] = InstanceRecord(
+        id=new_id, path=path, name=name, created_at=time.time(),
+        digest=instance_digest(path))
+    return new_id, name
+
+
+def _instance_preflight(rec: InstanceRecord, inst=None) -> Dict[str, Any]:
+    if rec.preflight is None:
+        p = preflight(inst if inst is not None else load_instance(rec.path))
+        rec.preflight = {
+            "hard_lower_bound": p.hard_lower_bound,
+            "infeasible": p.infeasible,
+            "defects": [asdict(d) for d in p.defects],
+            "notes": p.notes,
+        }
+    return rec.preflight
+
+
+def _result_key(rec: InstanceRecord, cfg: Dict[str, Any]) -> Optional[str]:
+    # warm starts depend on another job's result, portfolios and
+    # time-bounded climbs on the wall clock: never cached
+    if cfg.get("warm_start_job_id") or cfg.get("engine") == "portfolio" \
+            or cfg.get("memetic_ms"):
+        return None
+
+    # where and how often it runs does not change the result; the kernels
+    # backend (resolved by create_job) stays in the key
+    ga = asdict(_ga_config(cfg))
+    del ga["workers"], ga["remote"], ga["log_every"]
+    norm: Dict[str, Any] = {
+        "engine": cfg.get("engine", "ga"),
+        "decompose": bool(cfg.get("decompose")),
+        "ga": ga,
+    }
+    if norm["engine"] == "ls":
+        norm["ls_moves"] = int(cfg["ls_moves"])
+    return result_key(rec.digest, norm, SOLVER_VERSION)
+
+
+def _new_job(inst_id: str, inst_name: str, cfg: Dict[str, Any]) -> Job:
+    return Job(
+        id=str(uuid.uuid4()),
+        status="queued",
+        created_at=time.time(),
+        started_at=None,
+        finished_at=None,
+        error=None,
+        cfg=cfg,
+        history=[],
+        result=None,
+        instance_id=inst_id,
+        instance_name=inst_name,
+        lock=Lock(),
+    )
+
+
 def _run_job(job_id: str):
     j = JOBS[job_id]
     with j.lock:
@@ -309,6 +490,10 @@ def _run_job(job_id: str):
         j.started_at = time.time()
         j.error = None
         j.history = []
+        j.operator_history = []
+        j.best = None
+        j.best_view = None
+        j.kernels = None
         j.result = None
 
     try:
@@ -317,16 +502,9 @@ def _run_job(job_id: str):
             raise RuntimeError("Instance not found for job.")
         inst = load_instance(inst_rec.path)
 
-        cfg = GAConfig(
-            pop_size=int(j.cfg["pop"]),
-            generations=int(j.cfg["gen"]),
-            seed=int(j.cfg["seed"]),
-            use_repair=bool(j.cfg["repair"]),
-            log_every=int(j.cfg["log_every"]),
-            workers=int(j.cfg["workers"]),
-            repair_attempts_per_gene=int(j.cfg["repair_attempts_per_gene"]),
-            repair_max_rounds=int(j.cfg["repair_max_rounds"]),
-        )
+        cfg = _ga_config(j.cfg)
+        if j.cfg.get("remote"):
+            cfg = replace(cfg, remote=REMOTE_BROKER)
 
         def on_progress(row: HistoryRow) -> None:
             with j.lock:
@@ -335,7 +513,90 @@ def _run_job(job_id: str):
                 if len(j.history) > 5000:
                     j.history = j.history[-5000:]
 
-        best, pen, hist = solve(inst, cfg, progress_cb=on_progress)
+        def on_best(snap: BestSnapshot) -> None:
+            with j.lock:
+                j.best = snap
+
+        def on_operators(row: Dict[str, Any]) -> None:
+            with j.lock:
+                j.operator_history.append(row)
+                if len(j.operator_history) > 5000:
+                    j.operator_history = j.operator_history[-5000:]
+
+        merge_report = None
+        seeds = None
+        warm_start = None
+        prev_id = j.cfg.get("warm_start_job_id")
+        if prev_id:
+            prev = JOBS.get(prev_id)
+            if prev is None or prev.result is None:
+                raise RuntimeError("Warm-start job has no result.")
+            seed_ind, changed = warm_start_individual(
+                inst,
+                assignments_from_rows(prev.result["schedule"]),
+                random.Random(cfg.seed),
+            )
+            seeds = [seed_ind]
+            warm_start = {
+                "job_id": prev_id,
+                "reused": len(seed_ind) - len(changed),
+                "rerandomized": len(changed),
+            }
+
+        members = None
+        engine = j.cfg.get("engine", "ga")
+        # local search runs on its own dict tracker
+        backend = "python" if engine == "ls" else resolve_kernels(cfg.kernels)
+        with j.lock:
+            j.kernels = backend
+        spec = SolveSpec(
+            instance_path=inst_rec.path,
+            engine=engine,
+            cfg=cfg,
+            member=_member_config(j.cfg) if engine == "ls" else None,
+            members=[_member_config({**j.cfg, "engine": "ga", **m})
+                     for m in j.cfg["members"]] if engine == "portfolio" else [],
+            target=int(j.cfg.get("target", 0)),
+            time_limit=float(j.cfg.get("time_limit", 0)) or None,
+            decompose=bool(j.cfg.get("decompose")),
+            seeds=seeds,
+            # a proven hard lower bound lets single runs stop once they reach it
+            hard_bound=(j.preflight or {}).get("hard_lower_bound", 0),
+        )
+
+        # the solve runs in its own process; this thread only applies its messages
+        outcome = None
+        for kind, payload in SolverProcess(spec).messages():
+            if kind == "progress":
+                on_progress(payload)
+            elif kind == "best":
+                on_best(payload)
+            elif kind == "operators":
+                on_operators(payload)
+            elif kind == "decompose":
+                merge_report = payload
+            elif kind == "error":
+                raise RuntimeError(payload)
+            else:
+                outcome = payload
+        best, pen, hist, entries = outcome
+
+        if entries is not None:
+            with j.lock:
+                hist = list(j.history)
+            members = [
+                {
+                    "rank": rank,
+                    "member": e.member,
+                    "engine": engine_of(e.config),
+                    "cfg": j.cfg["members"][e.member],
+                    "penalty": {"total": e.penalty.total, "hard": e.penalty.hard, "soft": e.penalty.soft},
+                    "seconds": e.seconds,
+                    "stopped": e.stopped,
+                    "history": e.history,
+                }
+                for rank, e in enumerate(entries, start=1)
+            ]
 
         rows = _build_schedule_rows(best, inst)
         group_rows = _build_group_rows(best, inst)
@@ -355,8 +616,85 @@ def _run_job(job_id: str):
                 "schedule": rows,
                 "by_group": group_rows,
                 "instance": _instance_view(inst),
+                "warm_start": warm_start,
+                "decompose": merge_report,
+                "portfolio": members,
+                "operator_history": list(j.operator_history),
+                "kernels": backend,
+            }
+
+            j.status = "done"
+            j.finished_at = time.time()
+
+        if j.cache_key is not None:
+            RESULTS.finish(j.cache_key, j.id, j.result, hist)
+
+    except Exception as e:
+        with j.lock:
+            j.status = "error"
+            j.error = str(e)
+            j.finished_at = time.time()
+        if j.cache_key is not None:
+            RESULTS.abandon(j.cache_key, j.id)
+
+
+def _run_sweep(sweep_id: str):
+    j = SWEEPS[sweep_id]
+    with j.lock:
+        j.status = "running"
+        j.started_at = time.time()
+
+    try:
+        inst_rec = INSTANCES.get(j.instance_id)
+        if inst_rec is None:
+            raise RuntimeError("Instance not found for sweep.")
+        inst = load_instance(inst_rec.path)
+
+        variant_cfgs = j.cfg["variants"]
+        spec = SolveSpec(
+            instance_path=inst_rec.path,
+            engine="sweep",
+            cfg=GAConfig(workers=int(j.cfg["workers"])),
+            variants=[_ga_config(v) for v in variant_cfgs],
+            min_generations=int(j.cfg["min_gen"]),
+            eta=int(j.cfg["eta"]),
+        )
+
+        # like jobs, the sweep runs in its own process
+        entries = None
+        for kind, payload in SolverProcess(spec).messages():
+            if kind == "progress":
+                with j.lock:
+                    j.history.append(payload)
+            elif kind == "error":
+                raise RuntimeError(payload)
+            elif kind == "done":
+                entries = payload[3]
+
+        winner = entries[0]
+        ranking = [
+            {
+                "rank": rank,
+                "variant": e.variant,
+                "cfg": variant_cfgs[e.variant],
+                "penalty": {"total": e.penalty.total, "hard": e.penalty.hard, "soft": e.penalty.soft},
+                "generations_run": e.generations_run,
+                "pruned_at_rung": e.pruned_at,
+                "history": e.history,
             }
+            for rank, e in enumerate(entries, start=1)
+        ]
 
+        with j.lock:
+            j.result = {
+                "ranking": ranking,
+                "best": {
+                    "variant": winner.variant,
+                    "penalty": {"total": winner.penalty.total, "hard": winner.penalty.hard, "soft": winner.penalty.soft, "details": winner.penalty.details},
+                    "validation": _validate(winner.best, inst),
+                    "schedule": _build_schedule_rows(winner.best, inst),
+                },
+            }
             j.status = "done"
             j.finished_at = time.time()
 
@@ -376,9 +714,11 @@ def health():
 async def preview_instance(instance: UploadFile = File(...)):
     inst_id, name, path = _save_uploaded_json(instance)
     inst = load_instance(path)
-    INSTANCES[inst_id] = InstanceRecord(
-        id=inst_id, path=path, name=name, created_at=time.time())
-    return {"instance_id": inst_id, "name": name, "instance": _instance_view(inst)}
+    rec = INSTANCES[inst_id] = InstanceRecord(
+        id=inst_id, path=path, name=name, created_at=time.time(),
+        digest=instance_digest(path))
+    return {"instance_id": inst_id, "name": name, "instance": _instance_view(inst),
+            "preflight": _instance_preflight(rec, inst)}
 
 
 @api.get("/instances/{instance_id}")
@@ -402,50 +742,137 @@ async def create_job(
     log_every: int = Form(10),
     repair_attempts_per_gene: int = Form(15),
     repair_max_rounds: int = Form(2),
+    warm_start_job_id: str = Form(""),
+    decompose: bool = Form(False),
+    room_mode: str = Form("genome"),
+    init_constructive: float = Form(0.0),
+    repair_mode: str = Form("sample"),
+    repair_tracker: str = Form("flat"),
+    engine: str = Form("ga"),
+    ls_moves: int = Form(2000),
+    memetic_every: int = Form(0),
+    memetic_top_k: int = Form(4),
+    memetic_moves: int = Form(500),
+    memetic_ms: int = Form(0),
+    delta_eval: bool = Form(False),
+    breeding: str = Form("loop"),
+    symmetry: bool = Form(False),
+    fitness_cache: int = Form(0),
+    adaptive: bool = Form(False),
+    crossover: str = Form("two_point"),
+    remote: bool = Form(False),
+    kernels: str = Form("auto"),
+    members: str = Form(""),
+    time_limit: float = Form(0.0),
+    target: int = Form(0),
 ):
-    inst_id = instance_id.strip()
+    if engine not in ENGINES:
+        raise HTTPException(
+            status_code=400, detail=f"engine must be one of {ENGINES}")
+    if remote and not REMOTE_BROKER:
+        raise HTTPException(
+            status_code=400, detail="remote needs TIMETABLE_BROKER set on the server")
 
-    if inst_id:
-        if inst_id not in INSTANCES:
+    member_objs: List[Dict[str, Any]] = []
+    if engine == "portfolio":
+        try:
+            member_objs = json.loads(members) if members.strip() else DEFAULT_PORTFOLIO
+        except Exception:
+            raise HTTPException(status_code=400, detail="members must be JSON")
+        if not isinstance(member_objs, list) or not member_objs \
+                or not all(isinstance(m, dict) for m in member_objs):
             raise HTTPException(
-                status_code=404, detail="instance_id not found")
-        inst_name = INSTANCES[inst_id].name
-    else:
-        if instance is None:
+                status_code=400, detail="members must be a non-empty list of objects")
+        unknown = sorted({k for m in member_objs for k in m}
+                         - set(_CFG_FIELDS) - {"engine", "ls_moves"})
+        if unknown:
             raise HTTPException(
-                status_code=400, detail="Provide instance_id or upload instance file")
-
-        new_id, name, path = _save_uploaded_json(instance)
-        load_instance(path)
-        INSTANCES[new_id] = InstanceRecord(
-            id=new_id, path=path, name=name, created_at=time.time())
-        inst_id = new_id
-        inst_name = name
-
-    job_id = str(uuid.uuid4())
-    j = Job(
-        id=job_id,
-        status="queued",
-        created_at=time.time(),
-        started_at=None,
-        finished_at=None,
-        error=None,
-        cfg={
-            "pop": pop,
-            "gen": gen,
-            "seed": seed,
-            "repair": repair,
-            "workers": workers,
-            "log_every": log_every,
-            "repair_attempts_per_gene": repair_attempts_per_gene,
-            "repair_max_rounds": repair_max_rounds,
-        },
-        history=[],
-        result=None,
-        instance_id=inst_id,
-        instance_name=inst_name,
-        lock=Lock(),
-    )
+                status_code=400, detail=f"Unknown member keys: {unknown}")
+        if any(m.get("engine", "ga") not in MEMBER_ENGINES for m in member_objs):
+            raise HTTPException(
+                status_code=400, detail=f"member engine must be one of {MEMBER_ENGINES}")
+    if time_limit < 0:
+        raise HTTPException(status_code=400, detail="time_limit must be >= 0")
+
+    warm_start_job_id = warm_start_job_id.strip()
+    if warm_start_job_id:
+        prev = JOBS.get(warm_start_job_id)
+        if prev is None:
+            raise HTTPException(
+                status_code=404, detail="warm_start_job_id not found")
+        if prev.status != "done" or prev.result is None:
+            raise HTTPException(
+                status_code=409, detail="Warm-start job not finished")
+
+    inst_id, inst_name = _resolve_instance(instance_id, instance)
+
+    j = _new_job(inst_id, inst_name, {
+        "pop": pop,
+        "gen": gen,
+        "seed": seed,
+        "repair": repair,
+        "workers": workers,
+        "log_every": log_every,
+        "repair_attempts_per_gene": repair_attempts_per_gene,
+        "repair_max_rounds": repair_max_rounds,
+        "warm_start_job_id": warm_start_job_id,
+        "decompose": decompose,
+        "room_mode": room_mode,
+        "init_constructive": init_constructive,
+        "repair_mode": repair_mode,
+        "repair_tracker": repair_tracker,
+        "engine": engine,
+        "ls_moves": ls_moves,
+        "memetic_every": memetic_every,
+        "memetic_top_k": memetic_top_k,
+        "memetic_moves": memetic_moves,
+        "memetic_ms": memetic_ms,
+        "delta_eval": delta_eval,
+        "breeding": breeding,
+        "symmetry": symmetry,
+        "fitness_cache": fitness_cache,
+        "adaptive": adaptive,
+        "crossover": crossover,
+        "remote": remote,
+        "kernels": kernels,
+        "members": member_objs,
+        "time_limit": time_limit,
+        "target": target,
+    })
+
+    try:
+        # resolved here, so "auto" is recorded as what it falls back to and
+        # an explicit "numba" without numba fails now rather than in the run
+        j.cfg["kernels"] = resolve_kernels(kernels)
+        ga_cfg = _ga_config(j.cfg)
+        if engine == "ga":
+            check_config(ga_cfg)
+        for m in member_objs:
+            member = _member_config({**j.cfg, "engine": "ga", **m})
+            if isinstance(member, GAConfig):
+                check_config(replace(member, workers=1, log_every=0))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    j.preflight = _instance_preflight(INSTANCES[inst_id])
+    j.cache_key = _result_key(INSTANCES[inst_id], j.cfg)
+    if j.cache_key is not None:
+        hit, running = RESULTS.claim(j.cache_key, j.id)
+        if running is not None and running in JOBS:
+            return _job_view(JOBS[running])
+        if hit is not None:
+            now = time.time()
+            j.status = "done"
+            j.started_at = j.finished_at = now
+            j.history = hit.history
+            j.result = hit.result
+            j.operator_history = hit.result.get("operator_history") or []
+            j.cached_from = hit.job_id
+            j.cache_key = None
+            JOBS[j.id] = j
+            return _job_view(j)
+
+    job_id = j.id
     JOBS[job_id] = j
 
     t = threading.Thread(target=_run_job, args=(job_id,), daemon=True)
@@ -473,6 +900,135 @@ def get_result(job_id: str):
     return j.result
 
 
+@api.get("/jobs/{job_id}/best")
+def get_best(job_id: str):
+    """
+    Best-so-far schedule of a running (or finished) GA / local-search job.
+    Rows and validation are rendered once per incumbent version. Finished
+    jobs that published no snapshot (decomposed, portfolio or cached runs)
+    answer from their result.
+    """
+    if job_id not in JOBS:
+        raise HTTPException(status_code=404, detail="Job not found")
+    j = JOBS[job_id]
+    with j.lock:
+        snap, cached, status, result = j.best, j.best_view, j.status, j.result
+    if snap is None:
+        if status == "done" and result is not None:
+            return {"version": 0, "step": None, "status": status,
+                    **{k: result[k] for k in ("penalty", "validation", "schedule", "by_group")}}
+        raise HTTPException(status_code=409, detail="No incumbent yet")
+
+    if cached is None or cached[0] != snap.version:
+        rec = INSTANCES.get(j.instance_id)
+        if rec is None:
+            raise HTTPException(status_code=404, detail="Instance not found")
+        inst = load_instance(rec.path)
+        ind = snap.individual()
+        pen = snap.penalty
+        cached = (snap.version, {
+            "version": snap.version,
+            "step": snap.step,
+            "penalty": {"total": pen.total, "hard": pen.hard, "soft": pen.soft},
+            "validation": _validate(ind, inst),
+            "schedule": _build_schedule_rows(ind, inst),
+            "by_group": _build_group_rows(ind, inst),
+        })
+        with j.lock:
+            if j.best is snap:
+                j.best_view = cached
+    return {**cached[1], "status": status}
+
+
+@api.post("/sweeps")
+async def create_sweep(
+    instance_id: str = Form(""),
+    instance: UploadFile = File(None),
+    grid: str = Form(""),
+    variants: str = Form(""),
+    pop: int = Form(120),
+    gen: int = Form(600),
+    seed: int = Form(42),
+    repair: bool = Form(True),
+    repair_attempts_per_gene: int = Form(15),
+    repair_max_rounds: int = Form(2),
+    workers: int = Form(4),
+    min_gen: int = Form(25),
+    eta: int = Form(2),
+):
+    base = {
+        "pop": pop,
+        "gen": gen,
+        "seed": seed,
+        "repair": repair,
+        "repair_attempts_per_gene": repair_attempts_per_gene,
+        "repair_max_rounds": repair_max_rounds,
+    }
+
+    try:
+        grid_obj = json.loads(grid) if grid.strip() else {}
+        variant_objs = json.loads(variants) if variants.strip() else []
+    except Exception:
+        raise HTTPException(
+            status_code=400, detail="grid and variants must be JSON")
+    if not isinstance(grid_obj, dict) or not isinstance(variant_objs, list) \
+            or not all(isinstance(v, dict) for v in variant_objs):
+        raise HTTPException(
+            status_code=400, detail="grid must be an object and variants a list of objects")
+
+    unknown = sorted((set(grid_obj) | {k for v in variant_objs for k in v})
+                     - set(_CFG_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown config keys: {unknown}")
+
+    cfgs: List[Dict[str, Any]] = [{**base, **v} for v in variant_objs]
+    if not grid_obj and not cfgs:
+        raise HTTPException(
+            status_code=400, detail="Provide a grid or a list of variants")
+    # rejected here, not after the solver process has started
+    try:
+        if grid_obj:
+            cfgs += expand_grid(base, grid_obj)
+        check_sweep([_ga_config(c) for c in cfgs], min_gen, eta, workers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    inst_id, inst_name = _resolve_instance(instance_id, instance)
+
+    j = _new_job(inst_id, inst_name, {
+        "variants": cfgs,
+        "workers": workers,
+        "min_gen": min_gen,
+        "eta": eta,
+    })
+    SWEEPS[j.id] = j
+
+    t = threading.Thread(target=_run_sweep, args=(j.id,), daemon=True)
+    t.start()
+
+    return _job_view(j)
+
+
+@api.get("/sweeps/{sweep_id}")
+def get_sweep(sweep_id: str):
+    if sweep_id not in SWEEPS:
+        raise HTTPException(status_code=404, detail="Sweep not found")
+    return _job_view(SWEEPS[sweep_id])
+
+
+@api.get("/sweeps/{sweep_id}/result")
+def get_sweep_result(sweep_id: str):
+    if sweep_id not in SWEEPS:
+        raise HTTPException(status_code=404, detail="Sweep not found")
+    j = SWEEPS[sweep_id]
+    if j.status == "error":
+        raise HTTPException(status_code=400, detail=j.error or "Sweep failed")
+    if j.status != "done" or j.result is None:
+        raise HTTPException(status_code=409, detail="Sweep not finished")
+    return j.result
+
+
 app.include_router(api)
 
 
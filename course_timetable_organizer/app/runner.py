@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+from timetable.decompose import solve_decomposed
+from timetable.ga import GAConfig, solve
+from timetable.loader import load_instance
+from timetable.localsearch import solve as ls_solve
+from timetable.models import Individual
+from timetable.population import BestSnapshot
+from timetable.portfolio import Member, portfolio
+from timetable.sweep import sweep
+
+# (kind, payload): "progress" row, "operators" row, "best" snapshot,
+# "decompose" merge report, then one final "done" (best, penalty, history,
+# portfolio / sweep entries or None) or "error" message
+Message = Tuple[str, Any]
+
+
+@dataclass(frozen=True)
+class SolveSpec:
+    """What a solver process runs; built by the API from a job's config."""
+    instance_path: str
+    engine: str  # "ga", "ls", "portfolio" or "sweep"
+    cfg: GAConfig  # portfolio and sweep take only its `workers`
+    member: Optional[Member] = None  # the ls engine's config
+    members: List[Member] = field(default_factory=list)  # portfolio
+    variants: List[GAConfig] = field(default_factory=list)  # sweep
+    min_generations: int = 25
+    eta: int = 2
+    target: int = 0
+    time_limit: Optional[float] = None
+    decompose: bool = False
+    seeds: Optional[List[Individual]] = None
+    hard_bound: int = 0  # proven lower bound: single runs stop once they reach it
+
+
+def _solve(spec: SolveSpec, out) -> None:
+    def send(kind: str, payload: Any) -> None:
+        out.put((kind, payload))
+
+    def on_best(snap: BestSnapshot) -> None:
+        # decoded here: the parent has no compiled instance to decode with
+        send("best", BestSnapshot.of_individual(snap.version, snap.step, snap.penalty,
+                                                snap.individual()))
+
+    def on_progress(row) -> None:
+        send("progress", row)
+
+    try:
+        inst = load_instance(spec.instance_path)
+        bound = spec.hard_bound
+        entries = None
+        if spec.engine == "portfolio":
+            entries = portfolio(
+                inst,
+                spec.members,
+                target=spec.target,
+                time_limit=spec.time_limit,
+                workers=spec.cfg.workers,
+                progress_cb=on_progress,
+                seeds=spec.seeds,
+            )
+            best, pen, hist = entries[0].best, entries[0].penalty, None
+        elif spec.engine == "sweep":
+            entries = sweep(
+                inst,
+                spec.variants,
+                min_generations=spec.min_generations,
+                eta=spec.eta,
+                workers=spec.cfg.workers,
+                progress_cb=on_progress,
+            )
+            best, pen, hist = entries[0].best, entries[0].penalty, None
+        elif spec.engine == "ls":
+            best, pen, hist = ls_solve(
+                inst, spec.member, progress_cb=on_progress, seeds=spec.seeds,
+                should_stop=(lambda p: p.hard <= bound) if bound > 0 else None,
+                best_cb=on_best)
+        elif spec.decompose:
+            best, pen, hist = solve_decomposed(
+                inst, spec.cfg, progress_cb=on_progress, seeds=spec.seeds,
+                merge_cb=lambda report: send("decompose", report))
+        else:
+            best, pen, hist = solve(
+                inst, spec.cfg, progress_cb=on_progress, seeds=spec.seeds,
+                operator_cb=lambda row: send("operators", row),
+                hard_bound=bound, best_cb=on_best)
+        send("done", (best, pen, hist, entries))
+    except Exception as e:
+        send("error", str(e))
+
+
+_LIVE: Set["SolverProcess"] = set()
+_LIVE_LOCK = threading.Lock()
+
+
+class SolverProcess:
+    """
+    Runs one SolveSpec in a spawned process, so a solve never holds the
+    API process's GIL. Progress comes back over a queue; iterate
+    messages() from a thread of the API process to drain it.
+    """
+
+    def __init__(self, spec: SolveSpec, *, poll: float = 0.5):
+        ctx = mp.get_context("spawn")
+        self.poll = poll
+        self._queue = ctx.Queue()
+        # not daemonic: the GA and the portfolio start pools of their own
+        self._proc = ctx.Process(target=_solve, args=(spec, self._queue), name="timetable-solver")
+
+    def messages(self) -> Iterator[Message]:
+        """Starts the process and yields its messages, the final one last."""
+        with _LIVE_LOCK:
+            _LIVE.add(self)
+        self._proc.start()
+        try:
+            while True:
+                try:
+                    msg = self._queue.get(timeout=self.poll)
+                except queue.Empty:
+                    if self._proc.is_alive():
+                        continue
+                    try:
+                        msg = self._queue.get(timeout=self.poll)  # sent just before exiting
+                    except queue.Empty:
+                        yield "error", f"Solver process exited with code {self._proc.exitcode}."
+                        return
+                yield msg
+                if msg[0] in ("done", "error"):
+                    return
+        finally:
+            self.stop()
+            with _LIVE_LOCK:
+                _LIVE.discard(self)
+
+    def stop(self) -> None:
+        if self._proc.is_alive():
+            self._proc.join(timeout=self.poll)
+        if self._proc.is_alive():
+            self._proc.terminate()
+            self._proc.join()
+
+
+def stop_all() -> None:
+    """Terminates every running solver process (API shutdown)."""
+    with _LIVE_LOCK:
+        live = list(_LIVE)
+    for p in live:
+        p.stop()
@@ -0,0 +1,50 @@
+import json
+import random
+
+import pytest
+
+from timetable.loader import load_instance
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri"]
+
+
+def write_instance(path, seed: int = 1, n_courses: int = 30, slots_per_day: int = 6) -> str:
+    """Random instance JSON: normal rooms and two labs, partial teacher availability."""
+    rng = random.Random(seed)
+    timeslots = [{"id": f"{d}_{k}", "label": f"{d} {k}"}
+                 for d in DAYS for k in range(1, slots_per_day + 1)]
+    rooms = [{"id": f"R{i}", "capacity": rng.choice([30, 40, 60, 100]), "type": "normal"}
+             for i in range(6)]
+    rooms += [{"id": f"L{i}", "capacity": 30, "type": "lab"} for i in range(2)]
+    courses, availability = [], {}
+    for c in range(n_courses):
+        dept = c % 3
+        teacher = f"T{dept}_{rng.randrange(5)}"
+        courses.append({
+            "id": f"C{c}",
+            "teacher": teacher,
+            "groups": rng.sample([f"G{dept}_{g}" for g in range(4)], rng.choice([1, 1, 2])),
+            "size": rng.choice([20, 25, 30, 50]),
+            "sessions_per_week": rng.choice([1, 2, 3]),
+            "room_type": "lab" if rng.random() < 0.1 else "normal",
+        })
+        availability.setdefault(teacher, [t["id"] for t in timeslots if rng.random() < 0.8])
+    data = {
+        "timeslots": timeslots,
+        "rooms": rooms,
+        "courses": courses,
+        "teacher_availability": availability,
+        "preferences": {"late_slots": [f"{d}_{slots_per_day}" for d in DAYS],
+                        "avoid_days_for_course": {"C1": ["Fri"], "C2": ["Mon", "Tue"]}},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+@pytest.fixture
+def make_instance(tmp_path):
+    def make(seed: int = 1, n_courses: int = 30):
+        return load_instance(write_instance(tmp_path / f"inst_{seed}_{n_courses}.json",
+                                            seed, n_courses))
+    return make
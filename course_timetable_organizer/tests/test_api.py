@@ -0,0 +1,31 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from conftest import write_instance
+from timetable import kernels
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "INST_DIR", str(tmp_path))
+    c = TestClient(main.app)
+    path = write_instance(tmp_path / "inst.json")
+    with open(path, "rb") as f:
+        r = c.post("/api/instances/preview", files={"instance": ("inst.json", f, "application/json")})
+    return c, r.json()["instance_id"]
+
+
+def test_numba_kernels_rejected_without_numba(client, monkeypatch):
+    c, inst_id = client
+    monkeypatch.setattr(kernels, "HAVE_NUMBA", False)
+    r = c.post("/api/jobs", data={"instance_id": inst_id, "kernels": "numba"})
+    assert r.status_code == 400 and "numba" in r.json()["detail"]
+
+
+def test_result_key_keeps_kernels(client):
+    _, inst_id = client
+    rec = main.INSTANCES[inst_id]
+    python_key = main._result_key(rec, {"kernels": "python"})
+    assert python_key != main._result_key(rec, {"kernels": "numba"})
+    assert python_key == main._result_key(rec, {"kernels": "python", "workers": 8})
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from app.runner import SolveSpec, SolverProcess
+from conftest import write_instance
+from timetable.ga import GAConfig, solve
+from timetable.loader import load_instance
+from timetable.localsearch import LSConfig
+from timetable.preflight import preflight
+
+
+@pytest.fixture
+def infeasible(tmp_path):
+    """A random instance plus one group with 33 sessions for 30 timeslots."""
+    path = write_instance(tmp_path / "infeasible.json", seed=2)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    slots = [t["id"] for t in data["timeslots"]]
+    for k in range(11):
+        data["courses"].append({"id": f"X{k}", "teacher": f"TX{k}", "groups": ["GX"],
+                                "size": 20, "sessions_per_week": 3})
+        data["teacher_availability"][f"TX{k}"] = slots
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return path
+
+
+def test_ga_stops_at_bound_with_soft_penalty_left(infeasible):
+    inst = load_instance(infeasible)
+    bound = preflight(inst).hard_lower_bound
+    assert bound == 3
+
+    cfg = GAConfig(pop_size=30, generations=300, log_every=0, workers=1)
+    _, pen, hist = solve(inst, cfg, hard_bound=bound)
+    assert pen.hard == bound and pen.soft > 0
+    assert len(hist) < cfg.generations
+
+
+def test_ls_stops_at_bound_with_soft_penalty_left(infeasible):
+    bound = preflight(load_instance(infeasible)).hard_lower_bound
+    member = LSConfig(epochs=300, moves_per_epoch=500, log_every=0)
+    spec = SolveSpec(instance_path=infeasible, engine="ls", cfg=GAConfig(workers=1),
+                     member=member, hard_bound=bound)
+    kind, (_, pen, hist, _) = list(SolverProcess(spec).messages())[-1]
+    assert kind == "done"
+    assert pen.hard == bound and pen.soft > 0
+    assert len(hist) < member.epochs
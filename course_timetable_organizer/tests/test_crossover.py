@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+import pytest
+
+from timetable.compiled import compile_instance
+from timetable.crossover import CROSSOVERS
+from timetable.ga import GAConfig, solve
+from timetable.symmetry import Symmetry
+
+
+@pytest.mark.parametrize("name", sorted(CROSSOVERS))
+def test_children_keep_sibling_classes_whole(make_instance, name):
+    inst = make_instance(1)
+    ci = compile_instance(inst)
+    class_of = Symmetry.build(inst).class_of
+    assert np.bincount(class_of).max() > 1
+
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    n = len(inst.sessions)
+    for _ in range(20):
+        a, b = (np.stack([np_rng.integers(0, len(ci.timeslot_ids), n),
+                          np_rng.integers(0, len(ci.room_ids), n)]).astype(np.intc)
+                for _ in range(2))
+        for child in CROSSOVERS[name](a, b, rng, ci, class_of):
+            for c in range(class_of.max() + 1):
+                cols = class_of == c
+                assert (np.array_equal(child[:, cols], a[:, cols])
+                        or np.array_equal(child[:, cols], b[:, cols]))
+
+
+@pytest.mark.parametrize("name", sorted(CROSSOVERS))
+def test_symmetry_runs_with_each_crossover(make_instance, name):
+    inst = make_instance(2)
+    cfg = GAConfig(pop_size=20, generations=10, log_every=0, symmetry=True, crossover=name)
+    best, pen, hist = solve(inst, cfg)
+    assert len(best) == len(inst.sessions)
+    assert hist[-1][1] == pen.total
@@ -0,0 +1,16 @@
+from dataclasses import replace
+
+import pytest
+
+from timetable.ga import GAConfig, solve
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_delta_eval_matches_fresh_evaluation(make_instance, seed):
+    inst = make_instance(seed)
+    cfg = GAConfig(pop_size=20, generations=15, log_every=0, workers=1, seed=seed)
+    delta_best, delta_pen, delta_hist = solve(inst, replace(cfg, delta_eval=True))
+    best, pen, hist = solve(inst, cfg)
+    assert delta_best == best
+    assert delta_pen.total == pen.total
+    assert delta_hist == hist
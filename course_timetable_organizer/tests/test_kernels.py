@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from timetable import kernels
+from timetable.compiled import compile_instance
+from timetable.domains import compute_domains
+from timetable.fitness import evaluate, evaluate_encoded
+from timetable.population import encode
+from timetable.repair import repair
+
+# without numba installed the "numba" kernels run as plain Python: same code, same results
+SEEDS = [1, 2, 3]
+
+
+def _random_individuals(inst, rng, count):
+    tids = [t.id for t in inst.timeslots]
+    rids = list(inst.rooms)
+    return [[(rng.choice(tids), rng.choice(rids)) for _ in inst.sessions] for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("backend", ["python", "numba"])
+def test_evaluate_encoded_matches_evaluate(make_instance, seed, backend):
+    inst = make_instance(seed=seed, n_courses=40)
+    ci = compile_instance(inst)
+    for ind in _random_individuals(inst, random.Random(seed), 20):
+        ref = evaluate(ind, inst)
+        pen = evaluate_encoded(encode(ind, ci), ci, backend)
+        assert (pen.total, pen.hard, pen.soft) == (ref.total, ref.hard, ref.soft)
+        assert pen.details == ref.details
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_evaluate_counts_matches_evaluate(make_instance, seed):
+    inst = make_instance(seed=seed, n_courses=40)
+    ci = compile_instance(inst)
+    for ind in _random_individuals(inst, random.Random(seed), 20):
+        block = encode(ind, ci)
+        counts = kernels.evaluate_counts(
+            block[0], block[1], ci.sess_teacher_np, ci.member_sess, ci.member_group,
+            ci.sess_small_room, ci.sess_wrong_type, ci.sess_avail, ci.sess_avoid,
+            ci.ts_day, ci.ts_slot, ci.ts_late,
+            ci.n_ts, ci.n_rooms, ci.n_teachers, ci.n_groups, ci.n_days)
+        ref = evaluate(ind, inst)
+        assert {k: v for k, v in zip(kernels.COUNT_KEYS, counts.tolist()) if v} == ref.details
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_best_step_kernel_matches_python_repair(make_instance, seed):
+    inst = make_instance(seed=seed, n_courses=40)
+    ci = compile_instance(inst)
+    domains = compute_domains(inst)
+    for k, ind in enumerate(_random_individuals(inst, random.Random(seed), 4)):
+        runs = [repair(ind, inst, mode="best", domains=domains, tracker_kind="flat",
+                       compiled=ci, rng=random.Random(k), max_rounds=2, kernels=backend)
+                for backend in ("python", "numba")]
+        assert runs[0] == runs[1]
+        assert evaluate(runs[1], inst).hard <= evaluate(ind, inst).hard
+
+
+def test_resolve():
+    assert kernels.resolve("python") == "python"
+    assert kernels.resolve("auto") == ("numba" if kernels.HAVE_NUMBA else "python")
+    with pytest.raises(ValueError):
+        kernels.resolve("fortran")
+    if not kernels.HAVE_NUMBA:
+        with pytest.raises(ValueError):
+            kernels.resolve("numba")
@@ -0,0 +1,15 @@
+from timetable.ga import GAConfig, solve
+from timetable.portfolio import portfolio
+
+
+def test_stalled_member_restarts_from_incumbent(make_instance):
+    inst = make_instance(1)
+    strong = GAConfig(pop_size=20, generations=60, seed=1, log_every=0)
+    weak = GAConfig(pop_size=20, generations=60, seed=2, use_repair=False, log_every=0)
+    _, alone, _ = solve(inst, weak)
+
+    entries = portfolio(inst, [strong, weak], workers=2, reseed_after=5)
+    by_member = {e.member: e for e in entries}
+    assert by_member[1].penalty.total < alone.total
+    # re-seeded runs continue one history
+    assert [row[0] for row in by_member[1].history] == list(range(61))
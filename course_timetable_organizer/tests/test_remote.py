@@ -0,0 +1,81 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from timetable import remote
+from timetable.ga import GAConfig, solve
+
+PKG = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KEY = "test-secret"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _spawn(*args: str) -> subprocess.Popen:
+    env = {**os.environ, remote.AUTHKEY_ENV: KEY}
+    return subprocess.Popen([sys.executable, "-m", "timetable.remote", *args], cwd=PKG, env=env)
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    """A localhost broker with three workers; yields (address, worker processes)."""
+    monkeypatch.setenv(remote.AUTHKEY_ENV, KEY)
+    address = f"127.0.0.1:{_free_port()}"
+    procs = [_spawn("broker", "--bind", address)]
+    try:
+        deadline = time.time() + 20
+        while True:
+            try:
+                remote.connect(address)
+                break
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.1)
+        workers = [_spawn("worker", "--broker", address, "--lease", "2") for _ in range(3)]
+        procs += workers
+        yield address, workers
+    finally:
+        for p in procs:
+            p.kill()
+            p.wait()
+
+
+def test_key_is_required(monkeypatch):
+    monkeypatch.delenv(remote.AUTHKEY_ENV, raising=False)
+    with pytest.raises(RuntimeError):
+        remote.authkey()
+    with pytest.raises(RuntimeError):
+        remote.connect("127.0.0.1:1")
+
+
+def test_remote_matches_local_and_survives_worker_loss(cluster, make_instance):
+    address, workers = cluster
+    inst = make_instance(seed=3, n_courses=30)
+    base = dict(pop_size=30, generations=12, log_every=0, seed=5,
+                repair_tracker="flat", workers=3)
+
+    _, local, _ = solve(inst, GAConfig(**base))
+    _, remote_pen, _ = solve(inst, GAConfig(remote=address, **base))
+    assert remote_pen.total == local.total
+
+    # SIGKILL a worker mid-run: its leased chunks are requeued after the lease
+    base["generations"] = 40
+    killer = threading.Timer(1.0, workers[0].kill)
+    killer.start()
+    try:
+        _, after_loss, _ = solve(inst, GAConfig(remote=address, **base))
+    finally:
+        killer.cancel()
+    assert workers[0].poll() is not None, "run ended before the worker was killed"
+    _, local_long, _ = solve(inst, GAConfig(**base))
+    assert after_loss.total == local_long.total
@@ -0,0 +1,25 @@
+import pytest
+
+from timetable.ga import GAConfig
+from timetable.sweep import check_sweep, sweep
+
+
+def test_survivors_resume_where_they_stopped(make_instance):
+    inst = make_instance(1)
+    variants = [GAConfig(pop_size=20, generations=40, seed=s, log_every=0) for s in (1, 2, 3, 4)]
+    entries = sweep(inst, variants, min_generations=10, eta=2, workers=1)
+
+    winner = entries[0]
+    assert winner.pruned_at is None and winner.generations_run == 40
+    # one history across all rungs: generations 0..40, best never worse
+    assert [row[0] for row in winner.history] == list(range(41))
+    totals = [row[1] for row in winner.history]
+    assert totals == sorted(totals, reverse=True)
+    assert winner.penalty.total == totals[-1]
+
+
+def test_check_sweep_rejects_bad_variants():
+    with pytest.raises(ValueError, match="Variant 1: elite"):
+        check_sweep([GAConfig(), GAConfig(pop_size=4, elite=4)], 25, 2, 1)
+    with pytest.raises(ValueError, match="eta"):
+        check_sweep([GAConfig()], 25, 1, 1)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+MOVES = ("timeslot", "room", "swap")
+
+# adaptive pursuit (Thierens 2005): quality learning rate, pursuit rate, floor
+PURSUIT_ALPHA = 0.3
+PURSUIT_BETA = 0.3
+PURSUIT_P_MIN = 0.1
+
+# 1/5 success rule on the mutation rate
+TARGET_SUCCESS = 0.2
+RATE_STEP = 1.2
+MUT_RATE_BOUNDS = (0.005, 0.5)
+CX_RATE_BOUNDS = (0.2, 1.0)
+CX_STEP = 0.05
+
+OperatorRow = Dict[str, Any]
+OperatorCb = Callable[[OperatorRow], None]
+
+
+def _clamp(x: float, bounds: Tuple[float, float]) -> float:
+    return min(max(x, bounds[0]), bounds[1])
+
+
+class OperatorController:
+    """
+    Per-generation control of the GA operators from child success (a child
+    beats the better of its parents after repair):
+
+    - mutation rate: 1/5 success rule, raised by RATE_STEP while more
+      than TARGET_SUCCESS of mutated children succeed, lowered otherwise;
+    - crossover rate: nudged by CX_STEP towards whichever of crossed or
+      copied children succeeded more often;
+    - move mix (timeslot / room / swap): adaptive pursuit, with each
+      child's success credited to its moves in proportion.
+    """
+
+    def __init__(self, mut_rate: float, cx_rate: float, moves: Sequence[str] = MOVES):
+        if not moves or any(m not in MOVES for m in moves):
+            raise ValueError(f"moves must be a non-empty subset of {MOVES}.")
+        self.mut_rate = _clamp(mut_rate, MUT_RATE_BOUNDS)
+        self.cx_rate = _clamp(cx_rate, CX_RATE_BOUNDS)
+        self.moves = tuple(moves)
+        k = len(self.moves)
+        self.probs = {m: 1.0 / k for m in self.moves}
+        self.quality = {m: 0.0 for m in self.moves}
+        self._p_min = PURSUIT_P_MIN if k > 1 else 1.0
+        self._p_max = 1.0 - (k - 1) * self._p_min
+        self._reset()
+
+    def _reset(self) -> None:
+        self._children = 0
+        self._mutated = [0, 0]       # [children with a move, of which improved]
+        self._crossed = [0, 0]
+        self._copied = [0, 0]
+        self._credit = {m: [0.0, 0.0] for m in self.moves}  # [weight, weighted successes]
+
+    def choose(self, rng: random.Random) -> str:
+        u = rng.random()
+        for m in self.moves[:-1]:
+            u -= self.probs[m]
+            if u < 0:
+                return m
+        return self.moves[-1]
+
+    def record(self, crossed: bool, moves: Dict[str, int], improved: bool) -> None:
+        self._children += 1
+        side = self._crossed if crossed else self._copied
+        side[0] += 1
+        side[1] += improved
+        n = sum(moves.values())
+        if not n:
+            return
+        self._mutated[0] += 1
+        self._mutated[1] += improved
+        for m, c in moves.items():
+            credit = self._credit[m]
+            credit[0] += c / n
+            credit[1] += improved * c / n
+
+    def update(self, gen: int) -> OperatorRow:
+        """Applies this generation's evidence and returns the decision made."""
+        success = self._mutated[1] / self._mutated[0] if self._mutated[0] else 0.0
+        if self._mutated[0]:
+            step = RATE_STEP if success > TARGET_SUCCESS else 1.0 / RATE_STEP
+            self.mut_rate = _clamp(self.mut_rate * step, MUT_RATE_BOUNDS)
+
+        if self._crossed[0] and self._copied[0]:
+            cx_success = self._crossed[1] / self._crossed[0]
+            copy_success = self._copied[1] / self._copied[0]
+            if cx_success != copy_success:
+                step = CX_STEP if cx_success > copy_success else -CX_STEP
+                self.cx_rate = _clamp(self.cx_rate + step, CX_RATE_BOUNDS)
+
+        for m, (weight, wins) in self._credit.items():
+            if weight:
+                self.quality[m] += PURSUIT_ALPHA * (wins / weight - self.quality[m])
+        best = max(self.moves, key=self.quality.__getitem__)
+        for m in self.moves:
+            goal = self._p_max if m == best else self._p_min
+            self.probs[m] += PURSUIT_BETA * (goal - self.probs[m])
+
+        row: OperatorRow = {
+            "gen": gen,
+            "children": self._children,
+            "success": round(success, 4),
+            "mut_rate": round(self.mut_rate, 4),
+            "cx_rate": round(self.cx_rate, 4),
+            "moves": {m: round(p, 4) for m, p in self.probs.items()},
+        }
+        self._reset()
+        return row
+
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from timetable.models import Instance, Individual
+
+ALWAYS = -1  # availability mask with every bit set
+
+
+@dataclass(frozen=True)
+class CompiledInstance:
+    """
+    Integer encoding of an Instance. Timeslots, rooms, teachers, groups and
+    room types become dense indices, and teacher availability becomes a
+    bitmask over timeslot indices.
+
+    The NumPy tables below serve whole-individual evaluation
+    (fitness.evaluate_encoded): per-session lookups into rooms, timeslots
+    and days, and the (session, group) memberships flattened into pairs.
+    """
+    timeslot_ids: List[str]
+    room_ids: List[str]
+    ts_index: Dict[str, int]
+    room_index: Dict[str, int]
+    n_teachers: int
+    n_groups: int
+    sess_teacher: array
+    sess_groups: List[Tuple[int, ...]]
+    sess_size: array
+    sess_rtype: array
+    room_cap: array
+    room_rtype: array
+    teacher_avail: List[int]
+    n_days: int
+    ts_day: np.ndarray          # day index per timeslot
+    ts_slot: np.ndarray         # slot number within its day
+    ts_late: np.ndarray         # 1 for a late slot
+    sess_teacher_np: np.ndarray
+    sess_small_room: np.ndarray  # (sessions, rooms) room too small
+    sess_wrong_type: np.ndarray  # (sessions, rooms) room type mismatch
+    sess_avail: np.ndarray      # (sessions, timeslots) teacher available
+    sess_avoid: np.ndarray      # (sessions, days) course avoids the day
+    member_sess: np.ndarray
+    member_group: np.ndarray
+    member_ptr: np.ndarray      # session i's pairs are member_ptr[i]:member_ptr[i + 1]
+
+    @property
+    def n_ts(self) -> int:
+        return len(self.timeslot_ids)
+
+    @property
+    def n_rooms(self) -> int:
+        return len(self.room_ids)
+
+    def encode(self, ind: Individual) -> Tuple[array, array]:
+        ts = array("i", [self.ts_index[t] for t, _ in ind])
+        rooms = array("i", [self.room_index[r] for _, r in ind])
+        return ts, rooms
+
+    def decode(self, ts: array, rooms: array) -> Individual:
+        tids, rids = self.timeslot_ids, self.room_ids
+        return [(tids[t], rids[r]) for t, r in zip(ts, rooms)]
+
+
+def compile_instance(inst: Instance) -> CompiledInstance:
+    timeslot_ids = [t.id for t in inst.timeslots]
+    room_ids = list(inst.rooms.keys())
+    ts_index = {t: k for k, t in enumerate(timeslot_ids)}
+
+    teachers: Dict[str, int] = {}
+    groups: Dict[str, int] = {}
+    rtypes: Dict[str, int] = {}
+    for s in inst.sessions:
+        teachers.setdefault(s.teacher, len(teachers))
+        for g in s.groups:
+            groups.setdefault(g, len(groups))
+    for r in inst.rooms.values():
+        rtypes.setdefault(r.rtype, len(rtypes))
+    for s in inst.sessions:
+        rtypes.setdefault(s.rtype, len(rtypes))
+
+    teacher_avail = [ALWAYS] * len(teachers)
+    for name, t in teachers.items():
+        av = inst.teacher_availability.get(name)
+        if av is not None:
+            mask = 0
+            for ts in av:
+                k = ts_index.get(ts)
+                if k is not None:
+                    mask |= 1 << k
+            teacher_avail[t] = mask
+
+    days: Dict[str, int] = {}
+    ts_day, ts_slot = [], []
+    for t in timeslot_ids:
+        day, slot = t.split("_", 1)
+        ts_day.append(days.setdefault(day, len(days)))
+        ts_slot.append(int(slot))
+    late = set(inst.preferences.get("late_slots", []))
+    avoid = inst.preferences.get("avoid_days_for_course", {})
+
+    n = len(inst.sessions)
+    sess_size = np.array([s.size for s in inst.sessions], dtype=np.intc)
+    sess_rtype = np.array([rtypes[s.rtype] for s in inst.sessions], dtype=np.intc)
+    room_cap = np.array([inst.rooms[r].capacity for r in room_ids], dtype=np.intc)
+    room_rtype = np.array([rtypes[inst.rooms[r].rtype] for r in room_ids], dtype=np.intc)
+
+    sess_avail = np.ones((n, len(timeslot_ids)), dtype=bool)
+    sess_avoid = np.zeros((n, len(days)), dtype=bool)
+    for i, s in enumerate(inst.sessions):
+        mask = teacher_avail[teachers[s.teacher]]
+        if mask != ALWAYS:
+            sess_avail[i] = [(mask >> k) & 1 for k in range(len(timeslot_ids))]
+        for d in avoid.get(s.course, ()):
+            if d in days:
+                sess_avoid[i, days[d]] = True
+
+    members = [(i, groups[g]) for i, s in enumerate(inst.sessions) for g in s.groups]
+
+    return CompiledInstance(
+        timeslot_ids=timeslot_ids,
+        room_ids=room_ids,
+        ts_index=ts_index,
+        room_index={r: k for k, r in enumerate(room_ids)},
+        n_teachers=len(teachers),
+        n_groups=len(groups),
+        sess_teacher=array("i", [teachers[s.teacher] for s in inst.sessions]),
+        sess_groups=[tuple(groups[g] for g in s.groups) for s in inst.sessions],
+        sess_size=array("i", [s.size for s in inst.sessions]),
+        sess_rtype=array("i", [rtypes[s.rtype] for s in inst.sessions]),
+        room_cap=array("i", [inst.rooms[r].capacity for r in room_ids]),
+        room_rtype=array("i", [rtypes[inst.rooms[r].rtype] for r in room_ids]),
+        teacher_avail=teacher_avail,
+        n_days=len(days),
+        ts_day=np.array(ts_day, dtype=np.intc),
+        ts_slot=np.array(ts_slot, dtype=np.intc),
+        ts_late=np.array([t in late for t in timeslot_ids], dtype=np.intc),
+        sess_teacher_np=np.array([teachers[s.teacher] for s in inst.sessions], dtype=np.intc),
+        sess_small_room=room_cap[None, :] < sess_size[:, None],
+        sess_wrong_type=room_rtype[None, :] != sess_rtype[:, None],
+        sess_avail=sess_avail,
+        sess_avoid=sess_avoid,
+        member_sess=np.array([i for i, _ in members], dtype=np.intc),
+        member_group=np.array([g for _, g in members], dtype=np.intc),
+        member_ptr=np.cumsum([0] + [len(s.groups) for s in inst.sessions]).astype(np.intc),
+    )
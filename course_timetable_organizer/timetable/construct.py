@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import heapq
+import random
+from typing import Dict, List, Optional, Set
+
+from timetable.models import Instance, Individual
+from timetable.domains import Domains, compute_domains
+
+
+def constructive_individual(
+    inst: Instance,
+    rng: random.Random,
+    domains: Optional[Domains] = None,
+) -> Individual:
+    """
+    DSATUR-style greedy construction. The next session placed is the one
+    with the fewest clash-free timeslots left; ties go to fewer available
+    timeslots, more group neighbours and fewer compatible rooms, then to
+    random noise so repeated calls give different timetables.
+
+    Each session takes a random clash-free timeslot with a free compatible
+    room (the tightest one), or the least conflicting slot if none is left.
+    """
+    if domains is None:
+        domains = compute_domains(inst)
+    ts_dom = domains.timeslots
+    compat = domains.rooms
+
+    room_ids = list(inst.rooms.keys())
+    n = len(inst.sessions)
+
+    by_teacher: Dict[str, List[int]] = {}
+    by_group: Dict[str, List[int]] = {}
+    for i, s in enumerate(inst.sessions):
+        by_teacher.setdefault(s.teacher, []).append(i)
+        for g in s.groups:
+            by_group.setdefault(g, []).append(i)
+
+    def neighbours(i: int) -> Set[int]:
+        s = inst.sessions[i]
+        out = set(by_teacher[s.teacher])
+        for g in s.groups:
+            out.update(by_group[g])
+        out.discard(i)
+        return out
+
+    group_degree = [sum(len(by_group[g]) for g in s.groups)
+                    for s in inst.sessions]
+    static = [(len(ts_dom[i]), -group_degree[i], len(compat[i]))
+              for i in range(n)]
+
+    teacher_busy: Dict[str, Set[str]] = {}
+    group_busy: Dict[str, Set[str]] = {}
+    room_busy: Dict[str, Set[str]] = {}
+
+    def clashes(i: int, ts: str) -> int:
+        s = inst.sessions[i]
+        c = ts in teacher_busy.get(s.teacher, ())
+        for g in s.groups:
+            c += ts in group_busy.get(g, ())
+        return c
+
+    free = [len(d) for d in ts_dom]
+    heap = [(free[i], static[i], rng.random(), i) for i in range(n)]
+    heapq.heapify(heap)
+
+    out: Individual = [("", "")] * n
+    placed = [False] * n
+
+    while heap:
+        f, _, _, i = heapq.heappop(heap)
+        if placed[i] or f != free[i]:
+            continue  # stale entry
+
+        s = inst.sessions[i]
+        ok = [t for t in ts_dom[i] if clashes(i, t) == 0]
+        with_room = [t for t in ok
+                     if any(r not in room_busy.get(t, ()) for r in compat[i])]
+        if with_room:
+            ts = rng.choice(with_room)
+        elif ok:
+            ts = rng.choice(ok)
+        else:
+            ts = min(ts_dom[i], key=lambda t: (clashes(i, t), rng.random()))
+
+        busy = room_busy.setdefault(ts, set())
+        room = next((r for r in compat[i] if r not in busy), None)
+        if room is None:
+            spare = [r for r in room_ids if r not in busy]
+            room = rng.choice(spare or compat[i] or room_ids)
+
+        # neighbours lose `ts` from their clash-free count unless it was
+        # already blocked for them
+        nb = neighbours(i)
+        newly_blocked = [j for j in nb
+                         if not placed[j] and clashes(j, ts) == 0 and ts in ts_dom[j]]
+
+        out[i] = (ts, room)
+        placed[i] = True
+        busy.add(room)
+        teacher_busy.setdefault(s.teacher, set()).add(ts)
+        for g in s.groups:
+            group_busy.setdefault(g, set()).add(ts)
+
+        for j in newly_blocked:
+            free[j] -= 1
+            heapq.heappush(heap, (free[j], static[j], rng.random(), j))
+
+    return out
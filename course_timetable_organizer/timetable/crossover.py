@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import random
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from timetable.compiled import CompiledInstance
+
+Children = Tuple[np.ndarray, np.ndarray]
+# (parent a, parent b, rng, compiled instance, sibling classes) -> two children
+Crossover = Callable[[np.ndarray, np.ndarray, random.Random, CompiledInstance,
+                      Optional[np.ndarray]], Children]
+
+
+def two_point(a: np.ndarray, b: np.ndarray, rng: random.Random, ci: CompiledInstance,
+              class_of: Optional[np.ndarray] = None) -> Children:
+    """Swaps a slice of session indices; with `class_of`, a slice of whole sibling classes."""
+    c1, c2 = a.copy(), b.copy()
+    n = a.shape[1] if class_of is None else int(class_of.max(initial=0)) + 1
+    i = rng.randrange(n)
+    j = rng.randrange(n)
+    if i > j:
+        i, j = j, i
+
+    if class_of is None:
+        c1[:, i:j] = b[:, i:j]
+        c2[:, i:j] = a[:, i:j]
+    else:
+        mask = (class_of >= i) & (class_of < j)
+        c1[:, mask] = b[:, mask]
+        c2[:, mask] = a[:, mask]
+    return c1, c2
+
+
+def _whole_classes(mask: np.ndarray, class_of: Optional[np.ndarray]) -> np.ndarray:
+    # a sibling class is in the mask when all of its sessions are
+    if class_of is None:
+        return mask
+    per_class = np.ones(int(class_of.max(initial=0)) + 1, dtype=bool)
+    np.logical_and.at(per_class, class_of, mask)
+    return per_class[class_of]
+
+
+def _inherit_days(keep: np.ndarray, other: np.ndarray, days: np.ndarray,
+                  ci: CompiledInstance, class_of: Optional[np.ndarray]) -> np.ndarray:
+    # `keep`'s chosen days come over whole; every other session takes
+    # `other`'s assignment unless that lands on a chosen day as well (or
+    # a sibling's does)
+    take = _whole_classes(~days[ci.ts_day[keep[0]]] & ~days[ci.ts_day[other[0]]], class_of)
+    child = keep.copy()
+    child[:, take] = other[:, take]
+    return child
+
+
+def day_block(a: np.ndarray, b: np.ndarray, rng: random.Random, ci: CompiledInstance,
+              class_of: Optional[np.ndarray] = None) -> Children:
+    """Each child inherits a random half of the days whole from one parent, the rest from the other."""
+    days = np.array([rng.random() < 0.5 for _ in range(ci.n_days)], dtype=bool)
+    return _inherit_days(a, b, days, ci, class_of), _inherit_days(b, a, days, ci, class_of)
+
+
+def group(a: np.ndarray, b: np.ndarray, rng: random.Random, ci: CompiledInstance,
+          class_of: Optional[np.ndarray] = None) -> Children:
+    """
+    Each child inherits whole weekly schedules of a random half of the
+    groups (or, on a coin flip, of the teachers) from one parent and the
+    remaining sessions from the other.
+    """
+    if rng.random() < 0.5:
+        chosen = np.array([rng.random() < 0.5 for _ in range(ci.n_teachers)], dtype=bool)
+        mask = chosen[ci.sess_teacher_np]
+    else:
+        chosen = np.array([rng.random() < 0.5 for _ in range(ci.n_groups)], dtype=bool)
+        mask = np.zeros(a.shape[1], dtype=bool)
+        mask[ci.member_sess[chosen[ci.member_group]]] = True
+    mask = _whole_classes(mask, class_of)
+    return np.where(mask, a, b), np.where(mask, b, a)
+
+
+def _uniform_child(first: np.ndarray, second: np.ndarray, rng: random.Random,
+                   ci: CompiledInstance, classes: List[List[int]]) -> np.ndarray:
+    rooms: Set[Tuple[int, int]] = set()
+    teachers: Set[Tuple[int, int]] = set()
+    groups: Set[Tuple[int, int]] = set()
+    teacher_of, groups_of = ci.sess_teacher, ci.sess_groups
+
+    def clashes(idxs: List[int], genes: List[List[int]]) -> bool:
+        ts_row, room_row = genes
+        return any((ts_row[i], room_row[i]) in rooms or (ts_row[i], teacher_of[i]) in teachers
+                   or any((ts_row[i], g) in groups for g in groups_of[i])
+                   for i in idxs)
+
+    f, s = first.tolist(), second.tolist()
+    out = [[0] * len(f[0]), [0] * len(f[0])]
+    for idxs in classes:
+        pick, alt = f, s
+        if rng.random() < 0.5:
+            pick, alt = alt, pick
+        if clashes(idxs, pick) and not clashes(idxs, alt):
+            pick = alt
+        for i in idxs:
+            ts, room = pick[0][i], pick[1][i]
+            rooms.add((ts, room))
+            teachers.add((ts, teacher_of[i]))
+            groups.update((ts, g) for g in groups_of[i])
+            out[0][i], out[1][i] = ts, room
+    return np.array(out, dtype=first.dtype)
+
+
+def uniform(a: np.ndarray, b: np.ndarray, rng: random.Random, ci: CompiledInstance,
+            class_of: Optional[np.ndarray] = None) -> Children:
+    """
+    Per-gene coin flip between the parents, in session order. A gene that
+    would collide (room, teacher or group at that timeslot) with genes
+    already placed takes the other parent's gene instead when that one
+    does not. With `class_of`, the flip and the fallback are per sibling
+    class, so siblings always come from the same parent.
+    """
+    if class_of is None:
+        classes = [[i] for i in range(a.shape[1])]
+    else:
+        classes = [[] for _ in range(int(class_of.max(initial=0)) + 1)]
+        for i, c in enumerate(class_of.tolist()):
+            classes[c].append(i)
+    return _uniform_child(a, b, rng, ci, classes), _uniform_child(b, a, rng, ci, classes)
+
+
+CROSSOVERS: Dict[str, Crossover] = {
+    "two_point": two_point,
+    "day_block": day_block,
+    "group": group,
+    "uniform": uniform,
+}
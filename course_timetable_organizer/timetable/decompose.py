@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from timetable import kernels as _kernels
+from timetable.models import Instance, Individual, Penalty
+from timetable.compiled import compile_instance
+from timetable.domains import compute_domains
+from timetable.fitness import evaluate
+from timetable.ga import GAConfig, HistoryRow, ProgressCb, derive_seed, solve
+from timetable.repair import repair
+from timetable.rooms import assign_rooms
+
+# {"blocks": n, "room_clashes": k}: k sessions still share a room after
+# the merged blocks' rooms were reconciled, before the merge repair
+MergeCb = Callable[[Dict[str, Any]], None]
+
+
+def conflict_components(inst: Instance) -> List[List[int]]:
+    """
+    Connected components of the session conflict graph: two sessions are
+    linked when they share a teacher or a group. Sessions in different
+    components only ever compete for rooms.
+    """
+    parent = list(range(len(inst.sessions)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    first_by_key: Dict[Tuple[str, str], int] = {}
+    for i, s in enumerate(inst.sessions):
+        keys = [("t", s.teacher)] + [("g", g) for g in s.groups]
+        for key in keys:
+            j = first_by_key.setdefault(key, i)
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[ri] = rj
+
+    comps: Dict[int, List[int]] = {}
+    for i in range(len(inst.sessions)):
+        comps.setdefault(find(i), []).append(i)
+    return sorted(comps.values(), key=len, reverse=True)
+
+
+def _blocks(comps: List[List[int]], min_block: int) -> List[List[int]]:
+    # tiny components are not worth a solve() each; pool them together
+    blocks = [c for c in comps if len(c) >= min_block]
+    rest = sorted(i for c in comps if len(c) < min_block for i in c)
+    if rest:
+        blocks.append(rest)
+    return blocks
+
+
+def sub_instance(inst: Instance, idxs: Sequence[int]) -> Instance:
+    sessions = [inst.sessions[i] for i in idxs]
+    teachers = {s.teacher for s in sessions}
+    return Instance(
+        timeslots=inst.timeslots,
+        rooms=inst.rooms,
+        sessions=sessions,
+        teacher_availability={t: av for t, av in inst.teacher_availability.items()
+                              if t in teachers},
+        preferences=inst.preferences,
+    )
+
+
+def reconcile_rooms(ind: Individual, inst: Instance) -> Individual:
+    """
+    Resolve room collisions between independently solved blocks by moving
+    clashing sessions to a free compatible room in the same timeslot
+    (smallest sufficient room first). Timeslots are left untouched; a
+    session with no free room keeps its clash (see room_clashes).
+    """
+    out = ind[:]
+    rooms_by_fit = sorted(inst.rooms.values(), key=lambda r: r.capacity)
+
+    used: Dict[str, set] = {}
+    clashing: List[int] = []
+    for i, (ts_id, room_id) in enumerate(out):
+        taken = used.setdefault(ts_id, set())
+        if room_id in taken:
+            clashing.append(i)
+        else:
+            taken.add(room_id)
+
+    for i in clashing:
+        ts_id, _ = out[i]
+        s = inst.sessions[i]
+        taken = used[ts_id]
+        for room in rooms_by_fit:
+            if room.id not in taken and room.capacity >= s.size and room.rtype == s.rtype:
+                out[i] = (ts_id, room.id)
+                taken.add(room.id)
+                break
+
+    return out
+
+
+def room_clashes(ind: Individual) -> int:
+    """Sessions placed in a (timeslot, room) an earlier session already holds."""
+    seen: set = set()
+    clashes = 0
+    for a in ind:
+        if a in seen:
+            clashes += 1
+        seen.add(a)
+    return clashes
+
+
+def _solve_block(inst: Instance, cfg: GAConfig, seeds: Optional[List[Individual]]):
+    return solve(inst, cfg, seeds=seeds)
+
+
+def _merge_histories(hists: List[List[HistoryRow]]) -> List[HistoryRow]:
+    n_gen = max(len(h) for h in hists)
+    out: List[HistoryRow] = []
+    for g in range(n_gen):
+        rows = [h[min(g, len(h) - 1)] for h in hists]
+        out.append((g, sum(r[1] for r in rows), sum(r[2] for r in rows),
+                    sum(r[3] for r in rows)))
+    return out
+
+
+def solve_decomposed(
+    inst: Instance,
+    cfg: GAConfig,
+    *,
+    progress_cb: Optional[ProgressCb] = None,
+    seeds: Optional[Sequence[Individual]] = None,
+    min_block: int = 8,
+    merge_cb: Optional[MergeCb] = None,
+) -> Tuple[Individual, Penalty, List[HistoryRow]]:
+    """
+    Solve each conflict-graph component as its own GA run, in parallel
+    across `cfg.workers` processes, then merge and reconcile rooms.
+
+    History rows sum the per-block bests generation by generation; the
+    last row is the evaluated merged timetable. While blocks run,
+    `progress_cb` gets a row as each one finishes, summing the bests of
+    the blocks finished so far. `merge_cb` receives how many room clashes
+    the merge could not reconcile.
+    """
+    blocks = _blocks(conflict_components(inst), min_block)
+    if len(blocks) <= 1:
+        return solve(inst, cfg, progress_cb=progress_cb, seeds=seeds)
+
+    seeds = list(seeds or [])
+    results: List[Optional[Tuple[Individual, Penalty, List[HistoryRow]]]] = [None] * len(blocks)
+    done: List[HistoryRow] = []
+
+    def finished(k: int, result) -> None:
+        results[k] = result
+        done.append(result[2][-1])
+        if progress_cb is not None:
+            progress_cb((max(r[0] for r in done), sum(r[1] for r in done),
+                         sum(r[2] for r in done), sum(r[3] for r in done)))
+
+    if cfg.workers > 1:
+        import multiprocessing as mp
+        ctx = mp.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(cfg.workers, len(blocks)), mp_context=ctx) as ex:
+            futures = {
+                ex.submit(
+                    _solve_block,
+                    sub_instance(inst, idxs),
+                    replace(cfg, workers=1, log_every=0, seed=derive_seed(cfg.seed, "block", k)),
+                    [[ind[i] for i in idxs] for ind in seeds] or None,
+                ): k
+                for k, idxs in enumerate(blocks)
+            }
+            for f in as_completed(futures):
+                finished(futures[f], f.result())
+    else:
+        for k, idxs in enumerate(blocks):
+            finished(k, _solve_block(
+                sub_instance(inst, idxs),
+                replace(cfg, log_every=0, seed=derive_seed(cfg.seed, "block", k)),
+                [[ind[i] for i in idxs] for ind in seeds] or None,
+            ))
+
+    merged: Individual = [("", "")] * len(inst.sessions)
+    for idxs, (best, _, _) in zip(blocks, results):
+        for i, a in zip(idxs, best):
+            merged[i] = a
+
+    if cfg.room_mode == "matching":
+        merged = assign_rooms(merged, inst)
+    else:
+        merged = reconcile_rooms(merged, inst)
+    if merge_cb is not None:
+        merge_cb({"blocks": len(blocks), "room_clashes": room_clashes(merged)})
+    if cfg.use_repair:
+        merged = repair(merged, inst, attempts_per_gene=cfg.repair_attempts_per_gene,
+                        max_rounds=cfg.repair_max_rounds, mode=cfg.repair_mode,
+                        domains=compute_domains(inst), tracker_kind=cfg.repair_tracker,
+                        compiled=compile_instance(inst),
+                        rng=random.Random(derive_seed(cfg.seed, "merge")),
+                        kernels=_kernels.resolve(cfg.kernels))
+    pen = evaluate(merged, inst)
+
+    history = _merge_histories([h for _, _, h in results])
+    history[-1] = (history[-1][0], pen.total, pen.hard, pen.soft)
+    if progress_cb is not None:
+        progress_cb(history[-1])
+
+    return merged, pen, history
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+from timetable.models import Instance
+from timetable.rooms import compatible_rooms
+
+
+@dataclass(frozen=True)
+class Domains:
+    timeslots: List[List[str]]  # per session, instance order
+    rooms: List[List[str]]      # per session, tightest first
+    defects: List[str]          # what propagation proved cannot be satisfied
+
+
+def day_of(ts_id: str) -> str:
+    return ts_id.split("_", 1)[0]
+
+
+def compute_domains(inst: Instance) -> Domains:
+    """
+    Per-session (timeslot, room) domains, reduced once before search.
+
+    Starts from teacher availability and room capacity/type, then
+    propagates the all-different constraints of every teacher and group
+    to a fixpoint. A set of k sessions that together cover exactly k slots
+    claims those slots, which are removed from the rest of the teacher's
+    or group's sessions. Candidate sets are sessions with identical
+    domains (a session pinned to a single slot is the k=1 case) and
+    sessions confined to the same day. A domain is never emptied;
+    impossible situations are recorded in `defects` instead.
+    """
+    timeslot_ids = [t.id for t in inst.timeslots]
+    room_ids = list(inst.rooms.keys())
+    defects: List[str] = []
+
+    ts_dom: List[Set[str]] = []
+    for s in inst.sessions:
+        av = inst.teacher_availability.get(s.teacher)
+        ts = {t for t in timeslot_ids if av is None or t in av}
+        if not ts:
+            defects.append(
+                f"session {s.id}: teacher {s.teacher} has no available timeslot")
+            ts = set(timeslot_ids)
+        ts_dom.append(ts)
+
+    rooms = compatible_rooms(inst)
+    for i, s in enumerate(inst.sessions):
+        if not rooms[i]:
+            defects.append(
+                f"session {s.id}: no {s.rtype} room with capacity >= {s.size}")
+            rooms[i] = sorted(room_ids, key=lambda r: -inst.rooms[r].capacity)
+
+    cliques: Dict[str, List[int]] = {}
+    for i, s in enumerate(inst.sessions):
+        cliques.setdefault(f"teacher {s.teacher}", []).append(i)
+        for g in s.groups:
+            cliques.setdefault(f"group {g}", []).append(i)
+
+    member_of: Dict[int, List[str]] = {}
+    for name, idxs in cliques.items():
+        for i in idxs:
+            member_of.setdefault(i, []).append(name)
+
+    reported: Set[str] = set()
+    queue = deque(cliques)
+    queued = set(cliques)
+
+    while queue:
+        name = queue.popleft()
+        queued.discard(name)
+        idxs = cliques[name]
+
+        candidates: Dict[object, List[int]] = {}
+        for i in idxs:
+            candidates.setdefault(frozenset(ts_dom[i]), []).append(i)
+            days = {day_of(t) for t in ts_dom[i]}
+            if len(days) == 1:
+                candidates.setdefault(days.pop(), []).append(i)
+
+        for where, held in candidates.items():
+            union = set().union(*(ts_dom[i] for i in held))
+            if len(held) > len(union):
+                label = where if isinstance(where, str) else "/".join(sorted(where))
+                key = f"{name} on {label}"
+                if key not in reported:
+                    reported.add(key)
+                    defects.append(
+                        f"{name}: {len(held)} sessions confined to {len(union)} slots on {label}")
+                continue
+            if len(held) < len(union):
+                continue
+
+            claimed = set(held)
+            for j in idxs:
+                if j in claimed or not (ts_dom[j] & union):
+                    continue
+                rest = ts_dom[j] - union
+                if not rest:
+                    continue  # would empty the domain; reported elsewhere
+                ts_dom[j] = rest
+                for other in member_of[j]:
+                    if other not in queued:
+                        queued.add(other)
+                        queue.append(other)
+
+    for name, idxs in cliques.items():
+        union = set().union(*(ts_dom[i] for i in idxs))
+        if len(idxs) > len(union):
+            defects.append(
+                f"{name}: {len(idxs)} sessions but only {len(union)} usable timeslots")
+
+    order = {t: k for k, t in enumerate(timeslot_ids)}
+    return Domains(
+        timeslots=[sorted(d, key=order.__getitem__) for d in ts_dom],
+        rooms=rooms,
+        defects=defects,
+    )
@@ -5,6 +5,7 @@ from typing import List, Optional, Tuple
 import random
 
 from timetable.models import Instance, Individual, Penalty
+from timetable.construct import constructive_individual
 from timetable.fitness import evaluate
 from timetable.ga import GAConfig, solve
 
@@ -27,7 +28,13 @@ class GAResult:
     config: GAConfig
 
 
-def random_baseline(inst: Instance, tries: int, seed: int = 123) -> BaselineResult:
+def random_baseline(
+    inst: Instance,
+    tries: int,
+    seed: int = 123,
+    *,
+    constructive: bool = False,
+) -> BaselineResult:
     if tries <= 0:
         raise ValueError("tries must be > 0")
 
@@ -47,8 +54,11 @@ def random_baseline(inst: Instance, tries: int, seed: int = 123) -> BaselineResu
     n_sessions = len(inst.sessions)
 
     for _ in range(tries):
-        ind = [(rng.choice(timeslot_ids), rng.choice(room_ids))
-               for _ in range(n_sessions)]
+        if constructive:
+            ind = constructive_individual(inst, rng)
+        else:
+            ind = [(rng.choice(timeslot_ids), rng.choice(room_ids))
+                   for _ in range(n_sessions)]
         pen = evaluate(ind, inst)
         if best_pen is None or pen.total < best_pen.total:
             best_ind = ind
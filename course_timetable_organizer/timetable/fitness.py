@@ -3,7 +3,11 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Dict, Tuple
 
+import numpy as np
+
 from timetable.models import Instance, Individual, Penalty
+from timetable.compiled import CompiledInstance
+from timetable import kernels
 
 
 def evaluate(individual: Individual, inst: Instance) -> Penalty:
@@ -111,3 +115,69 @@ def evaluate(individual: Individual, inst: Instance) -> Penalty:
 
     total = hard * 1000 + soft
     return Penalty(total=total, hard=hard, soft=soft, details=dict(details))
+
+
+def _distinct(keys: np.ndarray, size: int) -> int:
+    return int(np.count_nonzero(np.bincount(keys, minlength=size)))
+
+
+def evaluate_encoded(genes: np.ndarray, ci: CompiledInstance, backend: str = "python") -> Penalty:
+    """
+    evaluate() over an encoded individual: genes[0] holds timeslot and
+    genes[1] room indices of `ci`. Same totals and details, vectorised,
+    or in one compiled pass with backend="numba" (see timetable.kernels).
+    """
+    if backend == "numba":
+        return _evaluate_kernel(genes, ci)
+    ts = genes[0]
+    rooms = genes[1]
+    n = len(ts)
+    sess = np.arange(n)
+    nr, nt, ng = max(1, ci.n_rooms), max(1, ci.n_teachers), max(1, ci.n_groups)
+
+    counts = {
+        "hard_capacity": int(np.count_nonzero(ci.sess_small_room[sess, rooms])),
+        "hard_room_type": int(np.count_nonzero(ci.sess_wrong_type[sess, rooms])),
+        "hard_teacher_availability": n - int(np.count_nonzero(ci.sess_avail[sess, ts])),
+        "hard_room_collision": n - _distinct(ts * nr + rooms, ci.n_ts * nr),
+        "hard_teacher_collision": n - _distinct(ts * nt + ci.sess_teacher_np, ci.n_ts * nt),
+    }
+
+    m_ts = ts[ci.member_sess]
+    group_ts = _distinct(m_ts * ng + ci.member_group, ci.n_ts * ng)
+    counts["hard_group_collision"] = len(m_ts) - group_ts
+
+    counts["soft_late_slot"] = int(ci.ts_late[ts].sum())
+    counts["soft_avoid_day"] = 2 * int(np.count_nonzero(ci.sess_avoid[sess, ci.ts_day[ts]]))
+
+    # per (group, day): last slot - first slot + 1 - distinct slots used
+    gaps = 0
+    if len(m_ts):
+        cell = ci.member_group * max(1, ci.n_days) + ci.ts_day[m_ts]
+        slot = ci.ts_slot[m_ts]
+        size = ng * max(1, ci.n_days)
+        hi = np.full(size, np.iinfo(np.intc).min, dtype=np.intc)
+        lo = np.full(size, np.iinfo(np.intc).max, dtype=np.intc)
+        np.maximum.at(hi, cell, slot)
+        np.minimum.at(lo, cell, slot)
+        used = hi >= lo
+        gaps = int((hi[used].astype(np.int64) - lo[used] + 1).sum()) - group_ts
+    counts["soft_gaps"] = gaps
+
+    hard = sum(v for k, v in counts.items() if k.startswith("hard_"))
+    soft = counts["soft_late_slot"] + counts["soft_avoid_day"] + gaps
+    details = {k: v for k, v in counts.items() if v}
+    return Penalty(total=hard * 1000 + soft, hard=hard, soft=soft, details=details)
+
+
+def _evaluate_kernel(genes: np.ndarray, ci: CompiledInstance) -> Penalty:
+    out = kernels.evaluate_counts(
+        genes[0], genes[1], ci.sess_teacher_np, ci.member_sess, ci.member_group,
+        ci.sess_small_room, ci.sess_wrong_type, ci.sess_avail, ci.sess_avoid,
+        ci.ts_day, ci.ts_slot, ci.ts_late,
+        ci.n_ts, max(1, ci.n_rooms), max(1, ci.n_teachers), max(1, ci.n_groups),
+        max(1, ci.n_days)).tolist()
+    hard = sum(out[:kernels.N_HARD])
+    soft = sum(out[kernels.N_HARD:])
+    details = {k: v for k, v in zip(kernels.COUNT_KEYS, out) if v}
+    return Penalty(total=hard * 1000 + soft, hard=hard, soft=soft, details=details)
@@ -1,46 +1,151 @@
 from __future__ import annotations
 
+import hashlib
 import random
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Callable, List, Optional, Sequence, Tuple
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from timetable.models import Instance, Individual, Penalty
-from timetable.fitness import evaluate
-from timetable.repair import repair
+from timetable import kernels as _kernels
+from timetable.adaptive import MOVES, OperatorCb, OperatorController
+from timetable.compiled import CompiledInstance, compile_instance
+from timetable.construct import constructive_individual
+from timetable.crossover import CROSSOVERS
+from timetable.domains import Domains, compute_domains
+from timetable.fitness import evaluate_encoded
+from timetable.localsearch import FullPenaltyTracker, hill_climb
+from timetable.population import (GENE_DTYPE, BestCb, BestSnapshot, DomainTable, Population,
+                                  breed, decode, encode, from_arrays, to_arrays)
+from timetable.repair import (REPAIR_MODES, TRACKERS, FlatHardConstraintTracker, repair,
+                              repair_in_place)
+from timetable.rooms import assign_rooms, compatible_rooms
+from timetable.symmetry import Symmetry
 
 HistoryRow = Tuple[int, int, int, int]  # (generation, total, hard, soft)
 ProgressCb = Callable[[HistoryRow], None]
+StopCb = Callable[[Penalty], bool]  # asked with the best so far; True ends the run
+PopulationCb = Callable[[List[Individual]], None]
 
 _WORKER_INST: Instance | None = None
-_WORKER_USE_REPAIR: bool = False
-_WORKER_ATTEMPTS: int = 20
-_WORKER_ROUNDS: int = 3
+_WORKER_COMPAT: List[List[str]] | None = None
+_WORKER_DOMAINS: Domains | None = None
+_WORKER_COMPILED: CompiledInstance | None = None
 
+ROOM_MODES = ("genome", "matching")
+BREEDING = ("loop", "numpy")
 
-def _init_worker(inst: Instance, use_repair: bool, attempts_per_gene: int, max_rounds: int) -> None:
-    global _WORKER_INST, _WORKER_USE_REPAIR, _WORKER_ATTEMPTS, _WORKER_ROUNDS
-    _WORKER_INST = inst
-    _WORKER_USE_REPAIR = use_repair
-    _WORKER_ATTEMPTS = attempts_per_gene
-    _WORKER_ROUNDS = max_rounds
 
+def derive_seed(*parts: object) -> int:
+    """
+    Stable 64-bit seed for a path such as (cfg.seed, "repair", gen, index).
+    Every random decision in a run draws from a stream seeded this way, so
+    results do not depend on threads, worker count or task scheduling.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
 
-def _repair_and_eval_worker(ind: Individual) -> Tuple[Individual, Penalty]:
+
+def _init_worker(inst: Instance) -> None:
+    global _WORKER_INST, _WORKER_COMPAT, _WORKER_DOMAINS, _WORKER_COMPILED
+    _WORKER_INST = inst
+    _WORKER_COMPAT = None
+    _WORKER_DOMAINS = compute_domains(inst)
+    _WORKER_COMPILED = compile_instance(inst)
+
+
+def make_pool(inst: Instance, workers: int, remote: str = ""):
+    """
+    Spawn a worker pool with the instance loaded once per process.
+    The pool can be shared by several solve() calls on the same instance;
+    repair settings travel with each task. With `remote` ("host:port" of a
+    timetable.remote broker) the tasks go to the broker's workers instead.
+    """
+    if remote:
+        from timetable.remote import RemotePool
+        return RemotePool(remote, _init_worker, (inst,))
+    import multiprocessing as mp
+    ctx = mp.get_context("spawn")
+    return ctx.Pool(processes=workers, initializer=_init_worker, initargs=(inst,))
+
+
+def _repair_and_eval(
+    block: np.ndarray,
+    seed: int,
+    inst: Instance,
+    compat: Optional[List[List[str]]],
+    domains: Domains,
+    compiled: CompiledInstance,
+    *,
+    use_repair: bool,
+    attempts_per_gene: int,
+    max_rounds: int,
+    repair_mode: str,
+    repair_tracker: str,
+    kernels: str = "python",
+) -> Tuple[np.ndarray, Penalty]:
+    # the flat tracker repairs the encoded block in place; the dict tracker
+    # and room matching work on the decoded individual
+    if compat is None and (not use_repair or repair_tracker == "flat"):
+        if use_repair:
+            tracker = FlatHardConstraintTracker(
+                None, inst, compiled, encoded=to_arrays(block), kernels=kernels)
+            repair_in_place(tracker, domains, attempts_per_gene=attempts_per_gene,
+                            max_rounds=max_rounds, mode=repair_mode,
+                            rng=random.Random(seed))
+            block = from_arrays(*tracker.arrays())
+        return block, evaluate_encoded(block, compiled, kernels)
+
+    # compat is set in "matching" room mode: rooms are decoded, not evolved
+    out = decode(block, compiled)
+    if compat is not None:
+        out = assign_rooms(out, inst, compat)
+    if use_repair:
+        out = repair(out, inst, attempts_per_gene=attempts_per_gene,
+                     max_rounds=max_rounds, mode=repair_mode, domains=domains,
+                     tracker_kind=repair_tracker, compiled=compiled,
+                     rng=random.Random(seed), kernels=kernels)
+        if compat is not None:
+            out = assign_rooms(out, inst, compat)
+
+    block = encode(out, compiled)
+    return block, evaluate_encoded(block, compiled, kernels)
+
+
+def _repair_and_eval_worker(
+    task: Tuple[np.ndarray, int],
+    *,
+    use_repair: bool,
+    attempts_per_gene: int,
+    max_rounds: int,
+    repair_mode: str,
+    repair_tracker: str,
+    match_rooms: bool,
+    kernels: str = "python",
+) -> Tuple[np.ndarray, Penalty]:
+    global _WORKER_COMPAT
     inst = _WORKER_INST
-    if inst is None:
+    if inst is None or _WORKER_DOMAINS is None or _WORKER_COMPILED is None:
         raise RuntimeError("Worker instance not initialised.")
 
-    out = ind
-    if _WORKER_USE_REPAIR:
-        out = repair(out, inst, attempts_per_gene=_WORKER_ATTEMPTS,
-                     max_rounds=_WORKER_ROUNDS)
+    if match_rooms and _WORKER_COMPAT is None:
+        _WORKER_COMPAT = compatible_rooms(inst)
 
-    pen = evaluate(out, inst)
-    return out, pen
+    block, seed = task
+    return _repair_and_eval(
+        block, seed, inst, _WORKER_COMPAT if match_rooms else None, _WORKER_DOMAINS,
+        _WORKER_COMPILED, use_repair=use_repair,
+        attempts_per_gene=attempts_per_gene, max_rounds=max_rounds,
+        repair_mode=repair_mode, repair_tracker=repair_tracker,
+        kernels=_kernels.resolve(kernels))
 
 
 def _repair_and_evaluate_population(
-    pop: List[Individual],
+    blocks: Sequence[np.ndarray],
+    seeds: Sequence[int],
     inst: Instance,
     pool,
     *,
@@ -48,24 +153,119 @@ def _repair_and_evaluate_population(
     attempts_per_gene: int,
     max_rounds: int,
     workers: int,
-) -> Tuple[List[Individual], List[Penalty]]:
+    repair_mode: str = "sample",
+    compat: Optional[List[List[str]]] = None,
+    domains: Optional[Domains] = None,
+    repair_tracker: str = "flat",
+    compiled: Optional[CompiledInstance] = None,
+    kernels: str = "python",
+) -> List[Tuple[np.ndarray, Penalty]]:
+    # pool workers resolve `kernels` themselves: remote ones may lack numba
+    if pool is None:
+        if domains is None:
+            domains = compute_domains(inst)
+        if compiled is None:
+            compiled = compile_instance(inst)
+        backend = _kernels.resolve(kernels)
+        return [
+            _repair_and_eval(block, seed, inst, compat, domains, compiled, use_repair=use_repair,
+                             attempts_per_gene=attempts_per_gene, max_rounds=max_rounds,
+                             repair_mode=repair_mode, repair_tracker=repair_tracker,
+                             kernels=backend)
+            for block, seed in zip(blocks, seeds)
+        ]
+
+    chunksize = max(1, len(blocks) // (workers * 4))
+    task = partial(_repair_and_eval_worker, use_repair=use_repair,
+                   attempts_per_gene=attempts_per_gene, max_rounds=max_rounds,
+                   repair_mode=repair_mode, repair_tracker=repair_tracker,
+                   match_rooms=compat is not None, kernels=kernels)
+    return pool.map(task, list(zip(blocks, seeds)), chunksize=chunksize)
+
+
+def _delta_repair_and_evaluate_population(
+    blocks: Sequence[np.ndarray],
+    parents: Sequence[Sequence[Tuple[np.ndarray, FullPenaltyTracker]]],
+    seeds: Sequence[int],
+    inst: Instance,
+    compiled: CompiledInstance,
+    domains: Domains,
+    *,
+    use_repair: bool,
+    attempts_per_gene: int,
+    max_rounds: int,
+    repair_mode: str,
+    max_changed: int,
+) -> List[Tuple[np.ndarray, Penalty, FullPenaltyTracker]]:
+    """
+    Serial repair + evaluation where each child starts from a copy of the
+    tracker of whichever parent (block, tracker) it differs least from,
+    and only the genes that differ are moved. Children with no parents, or
+    more than `max_changed` differing genes, get a fresh tracker.
+    Penalties carry no details.
+    """
+    tids, rids = compiled.timeslot_ids, compiled.room_ids
+    out: List[Tuple[np.ndarray, Penalty, FullPenaltyTracker]] = []
+
+    for block, candidates, seed in zip(blocks, parents, seeds):
+        base = None
+        best_changed: Optional[List[int]] = None
+        for parent_block, parent in candidates:
+            changed = np.flatnonzero((block != parent_block).any(axis=0)).tolist()
+            if best_changed is None or len(changed) < len(best_changed):
+                base, best_changed = parent, changed
+        if best_changed is not None and len(best_changed) <= max_changed:
+            tracker = base.copy()
+            ts, rooms = block.tolist()
+            for k in best_changed:
+                tracker.move(k, tids[ts[k]], rids[rooms[k]])
+        else:
+            tracker = FullPenaltyTracker(decode(block, compiled), inst)
+
+        if use_repair:
+            repair_in_place(tracker, domains, attempts_per_gene=attempts_per_gene,
+                            max_rounds=max_rounds, mode=repair_mode,
+                            rng=random.Random(seed))
+
+        pen = Penalty(tracker.total(), tracker.hard(), tracker.soft(), {})
+        out.append((encode(tracker.ind, compiled), pen, tracker))
+
+    return out
+
+
+def _hill_climb(block: np.ndarray, seed: int, inst: Instance, domains: Domains,
+                compiled: CompiledInstance, moves: int, time_ms: int) -> Tuple[np.ndarray, Penalty]:
+    ind = hill_climb(decode(block, compiled), inst, moves=moves, time_ms=time_ms,
+                     rng=random.Random(seed), domains=domains)
+    block = encode(ind, compiled)
+    return block, evaluate_encoded(block, compiled)
+
+
+def _hill_climb_worker(task: Tuple[np.ndarray, int], *, moves: int, time_ms: int) -> Tuple[np.ndarray, Penalty]:
+    inst = _WORKER_INST
+    if inst is None or _WORKER_DOMAINS is None or _WORKER_COMPILED is None:
+        raise RuntimeError("Worker instance not initialised.")
+    block, seed = task
+    return _hill_climb(block, seed, inst, _WORKER_DOMAINS, _WORKER_COMPILED, moves, time_ms)
+
+
+def _hill_climb_population(
+    blocks: Sequence[np.ndarray],
+    seeds: Sequence[int],
+    inst: Instance,
+    pool,
+    domains: Domains,
+    compiled: CompiledInstance,
+    *,
+    moves: int,
+    time_ms: int,
+) -> List[Tuple[np.ndarray, Penalty]]:
+    tasks = list(zip(blocks, seeds))
     if pool is None:
-        new_pop: List[Individual] = []
-        penalties: List[Penalty] = []
-        for ind in pop:
-            out = ind
-            if use_repair:
-                out = repair(
-                    out, inst, attempts_per_gene=attempts_per_gene, max_rounds=max_rounds)
-            new_pop.append(out)
-            penalties.append(evaluate(out, inst))
-        return new_pop, penalties
-
-    chunksize = max(1, len(pop) // (workers * 4))
-    results = pool.map(_repair_and_eval_worker, pop, chunksize=chunksize)
-    new_pop = [ind for ind, _ in results]
-    penalties = [pen for _, pen in results]
-    return new_pop, penalties
+        return [_hill_climb(block, seed, inst, domains, compiled, moves, time_ms)
+                for block, seed in tasks]
+    task = partial(_hill_climb_worker, moves=moves, time_ms=time_ms)
+    return pool.map(task, tasks, chunksize=1)
 
 
 @dataclass(frozen=True)
@@ -80,47 +280,63 @@ class GAConfig:
     use_repair: bool = True
     log_every: int = 25
     workers: int = 1
+    remote: str = ""  # broker "host:port": evaluate on remote workers (see timetable.remote)
     repair_attempts_per_gene: int = 15
     repair_max_rounds: int = 2
-
-
-def _tournament(pop: Sequence[Individual], scores: Sequence[int], k: int) -> Individual:
-    if not pop:
+    repair_mode: str = "sample"  # or "best": exhaustive delta-scored scan
+    repair_tracker: str = "flat"  # array-backed, repairs blocks encoded; or "dict"
+    # evaluation / flat-tracker repair kernels: "python", "numba" (needs
+    # numba) or "auto" (numba when installed); results are identical
+    kernels: str = "auto"
+    room_mode: str = "genome"  # "matching": evolve timeslots only, decode rooms
+    init_constructive: float = 0.0  # fraction of generation 0 built greedily
+    # memetic mode: hill-climb the top-k every N generations (0 = off)
+    memetic_every: int = 0
+    memetic_top_k: int = 4
+    memetic_moves: int = 500
+    memetic_ms: int = 0  # per individual; 0 = moves bound only
+    # evaluate children from their parent's tracker (serial, genome mode);
+    # above this fraction of changed genes a child is scored from scratch
+    delta_eval: bool = False
+    delta_max_changed: float = 0.25
+    breeding: str = "loop"  # or "numpy": whole generation bred in array ops
+    # keep sibling sessions of a course in canonical order and cross over
+    # whole courses; fitness_cache > 0 memoizes that many canonical children
+    symmetry: bool = False
+    fitness_cache: int = 0
+    # adapt mut_rate / cx_rate and the timeslot/room/swap mix per generation
+    # (loop breeding); cfg rates are the starting point
+    adaptive: bool = False
+    crossover: str = "two_point"  # or "day_block", "group", "uniform" (loop breeding)
+
+
+def _tournament(pop: Population, scores: Sequence[int], k: int,
+                rng: random.Random) -> int:
+    if not len(pop):
         raise ValueError("Population is empty.")
     if len(pop) != len(scores):
         raise ValueError("Population and scores length mismatch.")
     if k <= 0:
         raise ValueError("Tournament size k must be > 0.")
 
-    best_idx = random.randrange(len(pop))
+    best_idx = rng.randrange(len(pop))
     for _ in range(k - 1):
-        i = random.randrange(len(pop))
+        i = rng.randrange(len(pop))
         if scores[i] < scores[best_idx]:
             best_idx = i
-    return pop[best_idx]
+    return best_idx
 
 
-def _crossover(a: Individual, b: Individual, rate: float) -> Tuple[Individual, Individual]:
-    if random.random() > rate:
-        return a[:], b[:]
+def _crossover(a: np.ndarray, b: np.ndarray, rate: float, rng: random.Random,
+               cross: Callable[[np.ndarray, np.ndarray, random.Random],
+                               Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    if rng.random() > rate:
+        return a.copy(), b.copy()
+    return cross(a, b, rng)
 
-    n = len(a)
-    i = random.randrange(n)
-    j = random.randrange(n)
-    if i > j:
-        i, j = j, i
 
-    c1 = a[:i] + b[i:j] + a[j:]
-    c2 = b[:i] + a[i:j] + b[j:]
-    return c1, c2
-
-
-def solve(
-    inst: Instance,
-    cfg: GAConfig,
-    *,
-    progress_cb: Optional[ProgressCb] = None,
-) -> Tuple[Individual, Penalty, List[HistoryRow]]:
+def check_config(cfg: GAConfig) -> None:
+    """Raises ValueError for a GAConfig that solve() would reject."""
     if cfg.pop_size <= 0:
         raise ValueError("pop_size must be > 0.")
     if cfg.generations <= 0:
@@ -131,61 +347,272 @@ def solve(
         raise ValueError("log_every must be >= 0.")
     if cfg.workers <= 0:
         raise ValueError("workers must be >= 1.")
+    if cfg.room_mode not in ROOM_MODES:
+        raise ValueError(f"room_mode must be one of {ROOM_MODES}.")
+    if cfg.repair_mode not in REPAIR_MODES:
+        raise ValueError(f"repair_mode must be one of {REPAIR_MODES}.")
+    if cfg.repair_tracker not in TRACKERS:
+        raise ValueError(f"repair_tracker must be one of {TRACKERS}.")
+    _kernels.resolve(cfg.kernels)
+    if cfg.breeding not in BREEDING:
+        raise ValueError(f"breeding must be one of {BREEDING}.")
+    if cfg.adaptive and cfg.breeding != "loop":
+        raise ValueError("adaptive needs breeding='loop'.")
+    if cfg.crossover not in CROSSOVERS:
+        raise ValueError(f"crossover must be one of {tuple(CROSSOVERS)}.")
+    if cfg.crossover != "two_point" and cfg.breeding != "loop":
+        raise ValueError("only two_point crossover is vectorized; use breeding='loop'.")
+    if not 0.0 <= cfg.init_constructive <= 1.0:
+        raise ValueError("init_constructive must be in [0, 1].")
+    if cfg.memetic_every < 0 or cfg.memetic_top_k < 0:
+        raise ValueError("memetic_every and memetic_top_k must be >= 0.")
+    if cfg.delta_eval and (cfg.workers > 1 or cfg.remote or cfg.room_mode != "genome"):
+        raise ValueError("delta_eval needs workers=1, no remote and room_mode='genome'.")
+    if not 0.0 <= cfg.delta_max_changed <= 1.0:
+        raise ValueError("delta_max_changed must be in [0, 1].")
+    if cfg.fitness_cache < 0:
+        raise ValueError("fitness_cache must be >= 0.")
+    if cfg.fitness_cache and cfg.delta_eval:
+        raise ValueError("fitness_cache does not combine with delta_eval.")
 
-    random.seed(cfg.seed)
 
-    timeslot_ids = [t.id for t in inst.timeslots]
-    room_ids = list(inst.rooms.keys())
-    n_sessions = len(inst.sessions)
-
-    def random_individual() -> Individual:
-        return [(random.choice(timeslot_ids), random.choice(room_ids)) for _ in range(n_sessions)]
-
-    def mutate(ind: Individual) -> Individual:
-        out = ind[:]
-        for idx in range(len(out)):
-            if random.random() < cfg.mut_rate:
-                ts_id, room_id = out[idx]
-                if random.random() < 0.5:
-                    ts_id = random.choice(timeslot_ids)
+def solve(
+    inst: Instance,
+    cfg: GAConfig,
+    *,
+    progress_cb: Optional[ProgressCb] = None,
+    pool=None,
+    seeds: Optional[Sequence[Individual]] = None,
+    should_stop: Optional[StopCb] = None,
+    operator_cb: Optional[OperatorCb] = None,
+    hard_bound: int = 0,
+    best_cb: Optional[BestCb] = None,
+    population_cb: Optional[PopulationCb] = None,
+) -> Tuple[Individual, Penalty, List[HistoryRow]]:
+    """
+    `seeds` warm-starts the run: they enter generation 0 unchanged and the
+    rest of the population is filled with mutated copies of them.
+    `should_stop` is asked after every generation whether to end the run.
+    With cfg.adaptive, `operator_cb` receives each generation's operator
+    decision (rates and move mix). A positive `hard_bound` (a proven lower
+    bound on the hard penalty, see preflight) ends the run as soon as the
+    best individual reaches it. `best_cb` receives an immutable
+    BestSnapshot each time the best individual improves.
+    `population_cb` receives the final population, decoded; passed back
+    as `seeds`, it resumes the run.
+
+    The population is an encoded struct-of-arrays Population; only the
+    returned best individual (and the population for `population_cb`)
+    is decoded.
+    """
+    check_config(cfg)
+    if cfg.delta_eval and pool is not None:
+        raise ValueError("delta_eval needs workers=1, no remote and room_mode='genome'.")
+    backend = _kernels.resolve(cfg.kernels)
+
+    seeds = list(seeds or [])[:cfg.pop_size]
+    if any(len(ind) != len(inst.sessions) for ind in seeds):
+        raise ValueError("Seed individuals must have one gene per session.")
+
+    match_rooms = cfg.room_mode == "matching"
+    compat = compatible_rooms(inst) if match_rooms else None
+
+    # reduced (timeslot, room) domains, shared by init, mutation and repair
+    domains = compute_domains(inst)
+    compiled = compile_instance(inst)
+    n = len(inst.sessions)
+    ts_dom = [[compiled.ts_index[t] for t in d] for d in domains.timeslots]
+    room_dom = [[compiled.room_index[r] for r in d] for d in domains.rooms]
+    table = DomainTable.build(domains, compiled)
+    sym = Symmetry.build(inst) if cfg.symmetry else None
+    class_of = sym.class_of if sym is not None else None
+    cross = partial(CROSSOVERS[cfg.crossover], ci=compiled, class_of=class_of)
+
+    def random_block(rng: random.Random) -> np.ndarray:
+        genes = [(rng.choice(ts_dom[i]), rng.choice(room_dom[i])) for i in range(n)]
+        return np.array(genes, dtype=GENE_DTYPE).T.copy()
+
+    def mutate(block: np.ndarray, rng: random.Random) -> None:
+        ts, rooms = block
+        for idx in range(n):
+            if rng.random() < cfg.mut_rate:
+                if match_rooms or rng.random() < 0.5:
+                    ts[idx] = rng.choice(ts_dom[idx])
                 else:
-                    room_id = random.choice(room_ids)
-                out[idx] = (ts_id, room_id)
-        return out
-
-    pool = None
-    if cfg.workers > 1:
-        import multiprocessing as mp
-        ctx = mp.get_context("spawn")
-        pool = ctx.Pool(
-            processes=cfg.workers,
-            initializer=_init_worker,
-            initargs=(inst, cfg.use_repair,
-                      cfg.repair_attempts_per_gene, cfg.repair_max_rounds),
-        )
+                    rooms[idx] = rng.choice(room_dom[idx])
+
+    # an externally supplied pool is owned (and closed) by the caller
+    owns_pool = pool is None and (cfg.workers > 1 or bool(cfg.remote))
+    if owns_pool:
+        pool = make_pool(inst, cfg.workers, cfg.remote)
+
+    ctrl = None
+    if cfg.adaptive:
+        ctrl = OperatorController(cfg.mut_rate, cfg.cx_rate,
+                                  ("timeslot", "swap") if match_rooms else MOVES)
+
+    def mutate_adaptive(block: np.ndarray, rng: random.Random) -> Dict[str, int]:
+        counts = dict.fromkeys(ctrl.moves, 0)
+        ts, rooms = block
+        for idx in range(n):
+            if rng.random() < ctrl.mut_rate:
+                move = ctrl.choose(rng)
+                if move == "timeslot":
+                    ts[idx] = rng.choice(ts_dom[idx])
+                elif move == "room":
+                    rooms[idx] = rng.choice(room_dom[idx])
+                elif n > 1:
+                    other = rng.randrange(n - 1)
+                    other += other >= idx
+                    block[:, [idx, other]] = block[:, [other, idx]]
+                counts[move] += 1
+        return counts
+
+    version = 0
+
+    def publish(gen: int, block: np.ndarray, pen: Penalty) -> None:
+        nonlocal version
+        if best_cb is not None:
+            version += 1
+            best_cb(BestSnapshot.of_block(version, gen, pen, block, compiled))
 
     def emit(row: HistoryRow) -> None:
         if progress_cb is not None:
             progress_cb(row)
 
-    try:
-        pop: List[Individual] = [random_individual()
-                                 for _ in range(cfg.pop_size)]
-
-        pop, penalties = _repair_and_evaluate_population(
-            pop,
+    # delta_eval: trackers[i] holds the state of pop[i] for its children
+    trackers: List[Optional[FullPenaltyTracker]] = []
+    max_changed = int(cfg.delta_max_changed * n)
+    # canonical pre-repair child -> (repaired block, penalty), least recent first
+    fitness_cache: "OrderedDict[bytes, Tuple[np.ndarray, Penalty]]" = OrderedDict()
+    cache_hits = 0
+
+    def repair_and_evaluate(
+        pop: Population,
+        gen: int,
+        prev: Optional[Population] = None,
+        parents: Optional[List[Tuple[int, ...]]] = None,
+        kept: Optional[Dict[int, Tuple[Penalty, Optional[FullPenaltyTracker]]]] = None,
+    ) -> List[Penalty]:
+        """
+        Repairs and scores `pop` in place. Slots in `kept` already hold a
+        repaired, scored individual and are left alone.
+        """
+        nonlocal trackers, cache_hits
+        kept = kept or {}
+        todo = [k for k in range(len(pop)) if k not in kept]
+        if sym is not None:
+            for k in todo:
+                sym.canonicalize(pop[k])
+
+        penalties: List[Optional[Penalty]] = [None] * len(pop)
+        new_trackers: List[Optional[FullPenaltyTracker]] = [None] * len(pop)
+        for k, (pen, tracker) in kept.items():
+            penalties[k], new_trackers[k] = pen, tracker
+
+        if cfg.delta_eval:
+            # repaired blocks stay in tracker order, so they are not re-canonicalized
+            cands = [[(prev[p], trackers[p]) for p in parents[k]] if parents else ()
+                     for k in todo]
+            results = _delta_repair_and_evaluate_population(
+                [pop[k] for k in todo], cands,
+                [derive_seed(cfg.seed, "repair", gen, k) for k in todo],
+                inst, compiled, domains,
+                use_repair=cfg.use_repair,
+                attempts_per_gene=cfg.repair_attempts_per_gene,
+                max_rounds=cfg.repair_max_rounds,
+                repair_mode=cfg.repair_mode,
+                max_changed=max_changed,
+            )
+            for k, (block, pen, tracker) in zip(todo, results):
+                pop[k], penalties[k], new_trackers[k] = block, pen, tracker
+            trackers = new_trackers
+            return penalties
+
+        # children already in the cache, or repeated within this batch, are
+        # not repaired again
+        fresh: List[int] = []
+        keys: Dict[int, bytes] = {}
+        dupes: List[Tuple[int, int]] = []  # (slot, slot holding its first copy)
+        if cfg.fitness_cache:
+            first: Dict[bytes, int] = {}
+            for k in todo:
+                key = pop[k].tobytes()
+                hit = fitness_cache.get(key)
+                if hit is not None:
+                    fitness_cache.move_to_end(key)
+                    pop[k], penalties[k] = hit
+                    cache_hits += 1
+                elif key in first:
+                    dupes.append((k, first[key]))
+                    cache_hits += 1
+                else:
+                    first[key], keys[k] = k, key
+                    fresh.append(k)
+        else:
+            fresh = todo
+
+        results = _repair_and_evaluate_population(
+            [pop[k] for k in fresh],
+            [derive_seed(cfg.seed, "repair", gen, k) for k in fresh],
             inst,
             pool,
             use_repair=cfg.use_repair,
             attempts_per_gene=cfg.repair_attempts_per_gene,
             max_rounds=cfg.repair_max_rounds,
             workers=cfg.workers,
+            repair_mode=cfg.repair_mode,
+            compat=compat,
+            domains=domains,
+            repair_tracker=cfg.repair_tracker,
+            compiled=compiled,
+            kernels=cfg.kernels,
         )
+        for k, (block, pen) in zip(fresh, results):
+            if sym is not None:
+                sym.canonicalize(block)
+            pop[k], penalties[k] = block, pen
+            if cfg.fitness_cache:
+                # without repair `block` may be a view of pop's row, which
+                # later steps (the memetic climb) overwrite in place
+                fitness_cache[keys[k]] = (block.copy(), pen)
+                if len(fitness_cache) > cfg.fitness_cache:
+                    fitness_cache.popitem(last=False)
+        for k, src in dupes:
+            pop[k], penalties[k] = pop[src], penalties[src]
+        return penalties
+
+    try:
+        seed_blocks = [encode(ind, compiled) for ind in seeds]
+        blocks: List[np.ndarray] = list(seed_blocks)
+
+        n_built = 0 if seeds else round(cfg.init_constructive * cfg.pop_size)
+        if n_built:
+            build_rng = random.Random(derive_seed(cfg.seed, "construct"))
+            blocks += [encode(constructive_individual(inst, build_rng, domains), compiled)
+                       for _ in range(n_built)]
+
+        rng = random.Random(derive_seed(cfg.seed, "breed", 0))
+        if cfg.breeding == "numpy" and not seeds and len(blocks) < cfg.pop_size:
+            blocks += list(table.random_blocks(
+                np.random.default_rng(derive_seed(cfg.seed, "breed", 0)),
+                cfg.pop_size - len(blocks)))
+        while len(blocks) < cfg.pop_size:
+            if seeds:
+                block = seed_blocks[len(blocks) % len(seeds)].copy()
+                mutate(block, rng)
+            else:
+                block = random_block(rng)
+            blocks.append(block)
+
+        pop = Population.from_blocks(blocks, n)
+        penalties = repair_and_evaluate(pop, 0)
         totals: List[int] = [p.total for p in penalties]
 
         best_idx = min(range(len(pop)), key=totals.__getitem__)
-        best = pop[best_idx]
+        best = pop[best_idx].copy()
         best_pen = penalties[best_idx]
+        publish(0, best, best_pen)
 
         history: List[HistoryRow] = [
             (0, best_pen.total, best_pen.hard, best_pen.soft)]
@@ -197,34 +624,84 @@ def solve(
 
         for gen in range(1, cfg.generations + 1):
             ranked = sorted(range(len(pop)), key=totals.__getitem__)
-            new_pop: List[Individual] = [pop[i] for i in ranked[:cfg.elite]]
-
-            while len(new_pop) < cfg.pop_size:
-                p1 = _tournament(pop, totals, cfg.tournament_k)
-                p2 = _tournament(pop, totals, cfg.tournament_k)
-                c1, c2 = _crossover(p1, p2, cfg.cx_rate)
-                c1 = mutate(c1)
-                c2 = mutate(c2)
-                new_pop.append(c1)
-                if len(new_pop) < cfg.pop_size:
-                    new_pop.append(c2)
-
-            pop, penalties = _repair_and_evaluate_population(
-                new_pop,
-                inst,
-                pool,
-                use_repair=cfg.use_repair,
-                attempts_per_gene=cfg.repair_attempts_per_gene,
-                max_rounds=cfg.repair_max_rounds,
-                workers=cfg.workers,
-            )
+            elites = ranked[:cfg.elite]
+
+            # an elite without hard violations cannot change under repair:
+            # it keeps its score (and tracker) instead of being re-evaluated
+            kept = {k: (penalties[i], trackers[i] if cfg.delta_eval else None)
+                    for k, i in enumerate(elites)
+                    if penalties[i].hard == 0 and not match_rooms}
+
+            if cfg.breeding == "numpy":
+                new_pop, parents = breed(
+                    pop, np.asarray(totals), elites, table,
+                    np.random.default_rng(derive_seed(cfg.seed, "breed", gen)),
+                    tournament_k=cfg.tournament_k, cx_rate=cfg.cx_rate,
+                    mut_rate=cfg.mut_rate, timeslots_only=match_rooms, class_of=class_of)
+                k = cfg.pop_size
+            else:
+                rng = random.Random(derive_seed(cfg.seed, "breed", gen))
+                new_pop = Population.empty(cfg.pop_size, n)
+                new_pop.genes[:len(elites)] = pop.genes[elites]
+                parents = [(i,) for i in elites]
+                k = len(elites)
+
+            # adaptive: slot -> (crossed, moves applied) for the controller
+            applied: Dict[int, Tuple[bool, Dict[str, int]]] = {}
+            while k < cfg.pop_size:
+                i1 = _tournament(pop, totals, cfg.tournament_k, rng)
+                i2 = _tournament(pop, totals, cfg.tournament_k, rng)
+                if ctrl is None:
+                    c1, c2 = _crossover(pop[i1], pop[i2], cfg.cx_rate, rng, cross)
+                    mutate(c1, rng)
+                    mutate(c2, rng)
+                else:
+                    crossed = rng.random() <= ctrl.cx_rate
+                    c1, c2 = (cross(pop[i1], pop[i2], rng) if crossed
+                              else (pop[i1].copy(), pop[i2].copy()))
+                    applied[k] = (crossed, mutate_adaptive(c1, rng))
+                    applied[k + 1] = (crossed, mutate_adaptive(c2, rng))
+                new_pop[k] = c1
+                parents.append((i1, i2))
+                k += 1
+                if k < cfg.pop_size:
+                    new_pop[k] = c2
+                    parents.append((i2, i1))
+                    k += 1
+
+            penalties = repair_and_evaluate(new_pop, gen, pop, parents, kept)
+            if ctrl is not None:
+                for k, (crossed, moves) in applied.items():
+                    if k < cfg.pop_size:
+                        beat = min(totals[i] for i in parents[k])
+                        ctrl.record(crossed, moves, penalties[k].total < beat)
+                decision = ctrl.update(gen)
+                if operator_cb is not None:
+                    operator_cb(decision)
+            pop = new_pop
             totals = [p.total for p in penalties]
 
+            if cfg.memetic_every > 0 and cfg.memetic_top_k > 0 and gen % cfg.memetic_every == 0:
+                top = sorted(range(len(pop)), key=totals.__getitem__)[
+                    :cfg.memetic_top_k]
+                climbed = _hill_climb_population(
+                    [pop[i] for i in top],
+                    [derive_seed(cfg.seed, "climb", gen, k) for k in range(len(top))],
+                    inst, pool, domains, compiled,
+                    moves=cfg.memetic_moves, time_ms=cfg.memetic_ms)
+                for i, (block, pen) in zip(top, climbed):
+                    if sym is not None:
+                        sym.canonicalize(block)
+                    pop[i], penalties[i], totals[i] = block, pen, pen.total
+                    if cfg.delta_eval:
+                        trackers[i] = FullPenaltyTracker(decode(block, compiled), inst)
+
             cur_idx = min(range(len(pop)), key=totals.__getitem__)
             cur_pen = penalties[cur_idx]
             if cur_pen.total < best_pen.total:
-                best = pop[cur_idx]
+                best = pop[cur_idx].copy()
                 best_pen = cur_pen
+                publish(gen, best, best_pen)
 
             row = (gen, best_pen.total, best_pen.hard, best_pen.soft)
             history.append(row)
@@ -232,16 +709,27 @@ def solve(
             # emit at same cadence as log_every (and always emit the last generation)
             if cfg.log_every > 0 and (gen % cfg.log_every == 0 or gen == cfg.generations):
                 emit(row)
+                cached = f" cache_hits={cache_hits}" if cfg.fitness_cache else ""
                 print(
-                    f"gen={gen} best_total={best_pen.total} hard={best_pen.hard} soft={best_pen.soft}", flush=True)
+                    f"gen={gen} best_total={best_pen.total} hard={best_pen.hard} soft={best_pen.soft}{cached}", flush=True)
 
             if best_pen.hard == 0 and best_pen.soft == 0:
                 emit(row)
                 break
+            if hard_bound > 0 and best_pen.hard <= hard_bound:
+                emit(row)
+                break
+            if should_stop is not None and should_stop(best_pen):
+                emit(row)
+                break
 
-        return best, best_pen, history
+        if population_cb is not None:
+            population_cb([decode(pop[k], compiled) for k in range(len(pop))])
+        if cfg.delta_eval:
+            best_pen = evaluate_encoded(best, compiled, backend)  # tracker penalties carry no details
+        return decode(best, compiled), best_pen, history
 
     finally:
-        if pool is not None:
+        if owns_pool:
             pool.close()
             pool.join()
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional: the "python" backend needs nothing extra
+    numba = None
+
+BACKENDS = ("auto", "python", "numba")
+HAVE_NUMBA = numba is not None
+
+# evaluate_counts() order; names as in fitness.evaluate details
+COUNT_KEYS = (
+    "hard_capacity", "hard_room_type", "hard_teacher_availability",
+    "hard_room_collision", "hard_teacher_collision", "hard_group_collision",
+    "soft_late_slot", "soft_avoid_day", "soft_gaps",
+)
+N_COUNTS = 9
+N_HARD = 6
+
+# best_step() outcome kinds
+NO_STEP, MOVE, SWAP = 0, 1, 2
+
+
+def resolve(backend: str) -> str:
+    """The backend `backend` runs on here: "auto" is "numba" when it is installed."""
+    if backend not in BACKENDS:
+        raise ValueError(f"kernels must be one of {BACKENDS}.")
+    if backend == "auto":
+        return "numba" if HAVE_NUMBA else "python"
+    if backend == "numba" and not HAVE_NUMBA:
+        raise ValueError("kernels='numba' needs numba installed.")
+    return backend
+
+
+def _jit(fn):
+    # without numba the kernels stay plain (slow) Python; the "python"
+    # backend never calls them, but they remain runnable for checking
+    if numba is None:
+        return fn
+    return numba.njit(cache=True, nogil=True)(fn)
+
+
+@_jit
+def _step(count, k0, k1):
+    # one member leaves key k0 for k1; returns the change in collisions
+    d = 0
+    if count[k0] > 1:
+        d -= 1
+    count[k0] -= 1
+    if count[k1] >= 1:
+        d += 1
+    count[k1] += 1
+    return d
+
+
+@_jit
+def _shift(teacher_count, group_count, teacher, lo, hi, member_group, t0, t1, nt, ng):
+    # teacher and group keys of one session moving between timeslots
+    d = _step(teacher_count, t0 * nt + teacher, t1 * nt + teacher)
+    for m in range(lo, hi):
+        g = member_group[m]
+        d += _step(group_count, t0 * ng + g, t1 * ng + g)
+    return d
+
+
+@_jit
+def _unary(i, t, r, small, wrong, avail):
+    u = 0
+    if small[i, r]:
+        u += 1
+    if wrong[i, r]:
+        u += 1
+    if not avail[i, t]:
+        u += 1
+    return u
+
+
+@_jit
+def group_gaps(ts, member_sess, member_group, ts_day, ts_slot, n_ts, ng, nd):
+    """Soft gaps: per (group, day), last slot - first slot + 1 - distinct slots used."""
+    used = np.zeros(n_ts * ng, dtype=np.bool_)
+    hi = np.full(ng * nd, -(2 ** 31), dtype=np.int64)
+    lo = np.full(ng * nd, 2 ** 31, dtype=np.int64)
+    distinct = 0
+    for m in range(len(member_sess)):
+        t = ts[member_sess[m]]
+        g = member_group[m]
+        if not used[t * ng + g]:
+            used[t * ng + g] = True
+            distinct += 1
+        cell = g * nd + ts_day[t]
+        s = ts_slot[t]
+        if s > hi[cell]:
+            hi[cell] = s
+        if s < lo[cell]:
+            lo[cell] = s
+    span = 0
+    for c in range(ng * nd):
+        if hi[c] >= lo[c]:
+            span += hi[c] - lo[c] + 1
+    return span - distinct
+
+
+@_jit
+def evaluate_counts(ts, rooms, sess_teacher, member_sess, member_group,
+                    small, wrong, avail, avoid, ts_day, ts_slot, ts_late,
+                    n_ts, nr, nt, ng, nd):
+    """Penalty counts of one encoded individual, in COUNT_KEYS order."""
+    out = np.zeros(N_COUNTS, dtype=np.int64)
+    room_count = np.zeros(n_ts * nr, dtype=np.int32)
+    teacher_count = np.zeros(n_ts * nt, dtype=np.int32)
+    group_count = np.zeros(n_ts * ng, dtype=np.int32)
+    for i in range(len(ts)):
+        t = ts[i]
+        r = rooms[i]
+        if small[i, r]:
+            out[0] += 1
+        if wrong[i, r]:
+            out[1] += 1
+        if not avail[i, t]:
+            out[2] += 1
+        if room_count[t * nr + r] >= 1:
+            out[3] += 1
+        room_count[t * nr + r] += 1
+        k = t * nt + sess_teacher[i]
+        if teacher_count[k] >= 1:
+            out[4] += 1
+        teacher_count[k] += 1
+        out[6] += ts_late[t]
+        if avoid[i, ts_day[t]]:
+            out[7] += 2
+    for m in range(len(member_sess)):
+        k = ts[member_sess[m]] * ng + member_group[m]
+        if group_count[k] >= 1:
+            out[5] += 1
+        group_count[k] += 1
+    out[8] = group_gaps(ts, member_sess, member_group, ts_day, ts_slot, n_ts, ng, nd)
+    return out
+
+
+@_jit
+def best_step(idx, cand_ts, cand_rooms, ts, rooms, unary_by_idx,
+              room_count, room_sum, teacher_count, group_count,
+              sess_teacher, member_ptr, member_group, small, wrong, avail,
+              nr, nt, ng):
+    """
+    repair's "best" step over a flat tracker's arrays: the first strictly
+    best hard delta over moving session `idx` to each (timeslot, room) of
+    the candidate grid, or swapping it with the cell's sole occupant.
+    Returns (delta, kind, a, b): a MOVE goes to timeslot a, room b; a SWAP
+    is with session a. The counts are restored before returning.
+    """
+    t0 = ts[idx]
+    r0 = rooms[idx]
+    u0 = unary_by_idx[idx]
+    te = sess_teacher[idx]
+    lo = member_ptr[idx]
+    hi = member_ptr[idx + 1]
+    best, kind, a, b = 0, NO_STEP, 0, 0
+
+    for t1 in cand_ts:
+        for r1 in cand_rooms:
+            if t1 != t0 or r1 != r0:
+                d = _unary(idx, t1, r1, small, wrong, avail) - u0
+                d += _step(room_count, t0 * nr + r0, t1 * nr + r1)
+                _step(room_count, t1 * nr + r1, t0 * nr + r0)
+                if t1 != t0:
+                    d += _shift(teacher_count, group_count, te, lo, hi, member_group, t0, t1, nt, ng)
+                    _shift(teacher_count, group_count, te, lo, hi, member_group, t1, t0, nt, ng)
+                if d < best:
+                    best, kind, a, b = d, MOVE, t1, r1
+
+            k = t1 * nr + r1
+            if room_count[k] == 1 and room_sum[k] != idx:
+                j = room_sum[k]
+                tj = ts[j]
+                rj = rooms[j]
+                d = (_unary(idx, tj, rj, small, wrong, avail) - u0
+                     + _unary(j, t0, r0, small, wrong, avail) - unary_by_idx[j])
+                if t0 != tj:
+                    # room keys trade occupants one-for-one; only teacher/group keys move
+                    tj_te, j_lo, j_hi = sess_teacher[j], member_ptr[j], member_ptr[j + 1]
+                    d += _shift(teacher_count, group_count, te, lo, hi, member_group, t0, tj, nt, ng)
+                    d += _shift(teacher_count, group_count, tj_te, j_lo, j_hi, member_group, tj, t0, nt, ng)
+                    _shift(teacher_count, group_count, tj_te, j_lo, j_hi, member_group, t0, tj, nt, ng)
+                    _shift(teacher_count, group_count, te, lo, hi, member_group, tj, t0, nt, ng)
+                if d < best:
+                    best, kind, a, b = d, SWAP, j, 0
+
+    return best, kind, a, b
+
+
+def tracker_views(ts, rooms, unary_by_idx, room_count, room_sum,
+                  teacher_count, group_count) -> Tuple[np.ndarray, ...]:
+    """NumPy views sharing memory with a flat tracker's array("i"/"q") state."""
+    views = []
+    for buf in (ts, rooms, unary_by_idx, room_count, room_sum, teacher_count, group_count):
+        views.append(np.frombuffer(buf, dtype=np.int64 if buf.typecode == "q" else np.intc))
+    return tuple(views)
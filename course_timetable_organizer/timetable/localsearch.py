@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, DefaultDict, Dict, List, Optional, Sequence, Tuple
+
+from timetable.models import Instance, Individual, Penalty
+from timetable.construct import constructive_individual
+from timetable.domains import Domains, compute_domains, day_of
+from timetable.fitness import evaluate
+from timetable.population import BestCb, BestSnapshot
+from timetable.repair import HardConstraintTracker
+
+if TYPE_CHECKING:
+    from timetable.ga import GAConfig
+
+HistoryRow = Tuple[int, int, int, int]
+ProgressCb = Callable[[HistoryRow], None]
+StopCb = Callable[[Penalty], bool]
+
+
+class FullPenaltyTracker(HardConstraintTracker):
+    """
+    HardConstraintTracker that also keeps the SOFT penalty incrementally:
+    late slots, avoided days per course and per-(group, day) gaps, with
+    the same weights as fitness.evaluate. total() == evaluate(...).total.
+    """
+
+    def __init__(self, ind: Individual, inst: Instance):
+        self._late = set(inst.preferences.get("late_slots", []))
+        self._avoid = inst.preferences.get("avoid_days_for_course", {})
+        self._slot_cache: Dict[str, int] = {}
+        self._day_slots: DefaultDict[Tuple[str, str], DefaultDict[int, int]] = \
+            defaultdict(lambda: defaultdict(int))
+        self._soft_unary = 0
+        self._gaps = 0
+        super().__init__(ind, inst)
+
+    def copy(self) -> "FullPenaltyTracker":
+        new = super().copy()
+        new._day_slots = defaultdict(lambda: defaultdict(int))
+        for key, slots in self._day_slots.items():
+            new._day_slots[key] = slots.copy()
+        return new
+
+    def soft(self) -> int:
+        return self._soft_unary + self._gaps
+
+    def total(self) -> int:
+        return self.hard() * 1000 + self.soft()
+
+    def _slot_num(self, ts: str) -> int:
+        n = self._slot_cache.get(ts)
+        if n is None:
+            n = int(ts.split("_", 1)[1])
+            self._slot_cache[ts] = n
+        return n
+
+    def _soft_for(self, idx: int, ts: str) -> int:
+        u = 1 if ts in self._late else 0
+        avoid = self._avoid.get(self.inst.sessions[idx].course)
+        if avoid and day_of(ts) in avoid:
+            u += 2
+        return u
+
+    @staticmethod
+    def _gaps_of(slots: Dict[int, int]) -> int:
+        if not slots:
+            return 0
+        return max(slots) - min(slots) + 1 - len(slots)
+
+    def _bump_day(self, idx: int, ts: str, delta: int) -> None:
+        day = day_of(ts)
+        n = self._slot_num(ts)
+        for g in self.inst.sessions[idx].groups:
+            slots = self._day_slots[(g, day)]
+            before = self._gaps_of(slots)
+            c = slots[n] + delta
+            if c:
+                slots[n] = c
+            else:
+                del slots[n]
+            self._gaps += self._gaps_of(slots) - before
+
+    def _add_collision(self, idx: int, ts: str, room_id: str) -> None:
+        super()._add_collision(idx, ts, room_id)
+        self._soft_unary += self._soft_for(idx, ts)
+        self._bump_day(idx, ts, +1)
+
+    def _remove_collision(self, idx: int, ts: str, room_id: str) -> None:
+        super()._remove_collision(idx, ts, room_id)
+        self._soft_unary -= self._soft_for(idx, ts)
+        self._bump_day(idx, ts, -1)
+
+
+@dataclass(frozen=True)
+class LSConfig:
+    epochs: int = 600
+    moves_per_epoch: int = 2000
+    t0: float = 3.0
+    cooling: float = 0.97     # per epoch
+    reheat_after: int = 25    # epochs without a new best
+    conflict_bias: float = 0.5  # chance to pick a violating session
+    swap_rate: float = 0.2
+    seed: int = 42
+    log_every: int = 25
+
+    @classmethod
+    def from_ga(cls, cfg: GAConfig, **overrides) -> "LSConfig":
+        return cls(**{"epochs": cfg.generations, "seed": cfg.seed,
+                      "log_every": cfg.log_every, **overrides})
+
+
+def _random_move(
+    tracker: FullPenaltyTracker,
+    domains: Domains,
+    rng: random.Random,
+    conflict_bias: float,
+    swap_rate: float,
+) -> Tuple[int, Optional[int], Optional[Tuple[str, str]]]:
+    n = len(tracker.ind)
+    bad = tracker.conflicts()
+    if bad and rng.random() < conflict_bias:
+        idx = rng.choice(tuple(bad))
+    else:
+        idx = rng.randrange(n)
+
+    if n > 1 and rng.random() < swap_rate:
+        other = rng.randrange(n - 1)
+        return idx, other + (other >= idx), None
+
+    ts, room = tracker.assignment(idx)
+    if rng.random() < 0.5:
+        ts = rng.choice(domains.timeslots[idx])
+    else:
+        room = rng.choice(domains.rooms[idx])
+    return idx, None, (ts, room)
+
+
+def solve(
+    inst: Instance,
+    cfg: LSConfig,
+    *,
+    progress_cb: Optional[ProgressCb] = None,
+    seeds: Optional[Sequence[Individual]] = None,
+    should_stop: Optional[StopCb] = None,
+    best_cb: Optional[BestCb] = None,
+) -> Tuple[Individual, Penalty, List[HistoryRow]]:
+    """
+    Simulated annealing over hard and soft penalties together, on a
+    FullPenaltyTracker. Moves change a session's timeslot or room within
+    its domain, or swap two sessions' assignments. The temperature decays
+    per epoch and is reset to t0 after `reheat_after` epochs without a new
+    best. Same return contract as ga.solve; history rows are per epoch,
+    and `best_cb` gets a snapshot after each epoch that found a new best.
+    """
+    if cfg.epochs <= 0 or cfg.moves_per_epoch <= 0:
+        raise ValueError("epochs and moves_per_epoch must be > 0.")
+    if cfg.t0 <= 0 or not 0.0 < cfg.cooling <= 1.0:
+        raise ValueError("t0 must be > 0 and cooling in (0, 1].")
+    if cfg.log_every < 0:
+        raise ValueError("log_every must be >= 0.")
+
+    rng = random.Random(cfg.seed)
+    domains = compute_domains(inst)
+
+    if seeds:
+        start = list(seeds[0])
+    else:
+        start = constructive_individual(inst, rng, domains)
+    tracker = FullPenaltyTracker(start, inst)
+
+    cur = tracker.total()
+    best = tracker.ind[:]
+    best_total = cur
+    best_hard, best_soft = tracker.hard(), tracker.soft()
+    temp = cfg.t0
+    stale = 0
+
+    def emit(row: HistoryRow) -> None:
+        if progress_cb is not None:
+            progress_cb(row)
+
+    best_pen = evaluate(best, inst)
+    history: List[HistoryRow] = [
+        (0, best_pen.total, best_pen.hard, best_pen.soft)]
+    emit(history[-1])
+    version = 0
+    if best_cb is not None:
+        version += 1
+        best_cb(BestSnapshot.of_individual(version, 0, best_pen, best))
+
+    for epoch in range(1, cfg.epochs + 1):
+        improved = False
+        for _ in range(cfg.moves_per_epoch):
+            idx, other, target = _random_move(
+                tracker, domains, rng, cfg.conflict_bias, cfg.swap_rate)
+            if other is not None:
+                tracker.swap(idx, other)
+            else:
+                token = tracker.move(idx, *target)
+
+            new = tracker.total()
+            d = new - cur
+            if d <= 0 or rng.random() < math.exp(-d / temp):
+                cur = new
+                if cur < best_total:
+                    best_total = cur
+                    best_hard, best_soft = tracker.hard(), tracker.soft()
+                    best = tracker.ind[:]
+                    improved = True
+            elif other is not None:
+                tracker.swap(idx, other)
+            else:
+                tracker.undo(token)
+
+            if best_total == 0:
+                break
+
+        if improved and best_cb is not None:
+            version += 1
+            best_cb(BestSnapshot.of_individual(
+                version, epoch, Penalty(best_total, best_hard, best_soft, {}), best))
+
+        stale = 0 if improved else stale + 1
+        if stale >= cfg.reheat_after:
+            temp = cfg.t0
+            stale = 0
+        else:
+            temp *= cfg.cooling
+
+        row = (epoch, best_total, best_hard, best_soft)
+        history.append(row)
+        if cfg.log_every > 0 and (epoch % cfg.log_every == 0 or epoch == cfg.epochs):
+            emit(row)
+            print(
+                f"epoch={epoch} best_total={best_total} hard={best_hard} soft={best_soft} T={temp:.3f}", flush=True)
+
+        if best_total == 0:
+            emit(row)
+            break
+        if should_stop is not None and \
+                should_stop(Penalty(best_total, best_hard, best_soft, {})):
+            emit(row)
+            break
+
+    return best, evaluate(best, inst), history
+
+
+def hill_climb(
+    ind: Individual,
+    inst: Instance,
+    *,
+    moves: int,
+    time_ms: int = 0,
+    rng: Optional[random.Random] = None,
+    domains: Optional[Domains] = None,
+) -> Individual:
+    """
+    Bounded first-improvement descent on the full (hard + soft) penalty:
+    random domain moves and swaps, kept when they do not make things
+    worse. Stops after `moves` attempts or `time_ms` milliseconds.
+    """
+    rng = rng or random.Random()
+    if domains is None:
+        domains = compute_domains(inst)
+
+    tracker = FullPenaltyTracker(ind, inst)
+    cur = tracker.total()
+    deadline = time.perf_counter() + time_ms / 1000.0 if time_ms > 0 else None
+
+    for k in range(moves):
+        if cur == 0:
+            break
+        if deadline is not None and k % 64 == 0 and time.perf_counter() > deadline:
+            break
+
+        idx, other, target = _random_move(tracker, domains, rng, 0.5, 0.2)
+        if other is not None:
+            tracker.swap(idx, other)
+        else:
+            token = tracker.move(idx, *target)
+
+        new = tracker.total()
+        if new <= cur:
+            cur = new
+        elif other is not None:
+            tracker.swap(idx, other)
+        else:
+            tracker.undo(token)
+
+    return tracker.ind[:]
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from timetable.models import Assignment, Individual, Penalty
+from timetable.compiled import CompiledInstance
+from timetable.domains import Domains
+
+GENE_DTYPE = np.intc  # matches array("i"), so blocks and flat trackers share buffers
+
+
+def encode(ind: Individual, ci: CompiledInstance) -> np.ndarray:
+    """(2, sessions) block: row 0 timeslot indices, row 1 room indices."""
+    ts, rooms = ci.encode(ind)
+    return np.array([ts, rooms], dtype=GENE_DTYPE)
+
+
+def decode(block: np.ndarray, ci: CompiledInstance) -> Individual:
+    tids, rids = ci.timeslot_ids, ci.room_ids
+    return [(tids[t], rids[r]) for t, r in zip(block[0].tolist(), block[1].tolist())]
+
+
+def to_arrays(block: np.ndarray) -> Tuple[array, array]:
+    return array("i", block[0].tobytes()), array("i", block[1].tobytes())
+
+
+def from_arrays(ts: array, rooms: array) -> np.ndarray:
+    return np.stack([np.frombuffer(ts, dtype=GENE_DTYPE),
+                     np.frombuffer(rooms, dtype=GENE_DTYPE)])
+
+
+class Population:
+    """
+    Struct-of-arrays population: one (size, 2, sessions) integer array, so
+    every individual is a contiguous block of two int rows (timeslot and
+    room indices of a CompiledInstance). Individuals only become
+    (timeslot id, room id) lists when decoded at the edges of a run; the
+    exceptions are the paths whose tools work on ids: repair_tracker="dict",
+    room_mode="matching" and delta_eval's FullPenaltyTracker.
+
+    Elites are not shared copy-on-write with the next generation: each
+    generation is one contiguous array, so elite rows are copied into it
+    (2 * sessions ints apiece) instead of aliased.
+    """
+
+    __slots__ = ("genes",)
+
+    def __init__(self, genes: np.ndarray):
+        if genes.ndim != 3 or genes.shape[1] != 2:
+            raise ValueError("genes must have shape (size, 2, sessions).")
+        self.genes = genes
+
+    @classmethod
+    def empty(cls, size: int, n: int) -> "Population":
+        return cls(np.zeros((size, 2, n), dtype=GENE_DTYPE))
+
+    @classmethod
+    def from_blocks(cls, blocks: Sequence[np.ndarray], n: int) -> "Population":
+        if not blocks:
+            return cls.empty(0, n)
+        return cls(np.stack(blocks).astype(GENE_DTYPE, copy=False))
+
+    def __len__(self) -> int:
+        return self.genes.shape[0]
+
+    def __getitem__(self, k: int) -> np.ndarray:
+        return self.genes[k]
+
+    def __setitem__(self, k: int, block: np.ndarray) -> None:
+        self.genes[k] = block
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self.genes[:, 0]
+
+    @property
+    def rooms(self) -> np.ndarray:
+        return self.genes[:, 1]
+
+
+def _pad(doms: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    lens = np.array([len(d) for d in doms], dtype=GENE_DTYPE)
+    table = np.zeros((len(doms), max(lens, default=1)), dtype=GENE_DTYPE)
+    for i, d in enumerate(doms):
+        table[i, :len(d)] = d
+    return table, lens
+
+
+@dataclass(frozen=True)
+class DomainTable:
+    """Session domains as padded (sessions, max domain size) index tables."""
+    ts: np.ndarray
+    ts_len: np.ndarray
+    rooms: np.ndarray
+    room_len: np.ndarray
+
+    @classmethod
+    def build(cls, domains: Domains, ci: CompiledInstance) -> "DomainTable":
+        ts, ts_len = _pad([[ci.ts_index[t] for t in d] for d in domains.timeslots])
+        rooms, room_len = _pad([[ci.room_index[r] for r in d] for d in domains.rooms])
+        return cls(ts, ts_len, rooms, room_len)
+
+    def sample(self, table: np.ndarray, lens: np.ndarray, rng: np.random.Generator,
+               count: int) -> np.ndarray:
+        """(count, sessions) values drawn uniformly from each session's domain."""
+        pick = (rng.random((count, len(lens))) * lens).astype(np.intp)
+        return table[np.arange(len(lens)), pick]
+
+    def random_blocks(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """(count, 2, sessions) individuals with every gene drawn from its domain."""
+        return np.stack([self.sample(self.ts, self.ts_len, rng, count),
+                         self.sample(self.rooms, self.room_len, rng, count)], axis=1)
+
+
+def breed(
+    pop: Population,
+    totals: np.ndarray,
+    elites: Sequence[int],
+    table: DomainTable,
+    rng: np.random.Generator,
+    *,
+    tournament_k: int,
+    cx_rate: float,
+    mut_rate: float,
+    timeslots_only: bool = False,
+    class_of: Optional[np.ndarray] = None,
+) -> Tuple[Population, List[Tuple[int, ...]]]:
+    """
+    Next generation in bulk: elites copied first, then children from
+    k-tournaments, two-point crossover and per-gene mutation to a random
+    domain value (timeslot or room, evenly; timeslot only when
+    `timeslots_only`). With `class_of` the crossover cuts fall between
+    session classes, so a class is always inherited whole. Returns the
+    population and each slot's parents.
+    """
+    size, _, n = pop.genes.shape
+    if size == 0:
+        raise ValueError("Population is empty.")
+    if tournament_k <= 0:
+        raise ValueError("Tournament size k must be > 0.")
+
+    e = len(elites)
+    m = size - e
+    pairs = (m + 1) // 2
+
+    # tournaments: first of the minimum, like the sequential loop
+    entrants = rng.integers(0, size, size=(2 * pairs, tournament_k))
+    winners = entrants[np.arange(2 * pairs), np.argmin(totals[entrants], axis=1)]
+    i1, i2 = winners[:pairs], winners[pairs:]
+
+    if class_of is None:
+        cols, span = np.arange(n), n
+    else:
+        cols, span = class_of, int(class_of.max(initial=0)) + 1
+    cuts = np.sort(rng.integers(0, span, size=(pairs, 2)), axis=1)
+    swap = (cols >= cuts[:, :1]) & (cols < cuts[:, 1:]) & (rng.random(pairs) < cx_rate)[:, None]
+    a, b = pop.genes[i1], pop.genes[i2]
+    swap = swap[:, None, :]
+    children = np.empty((pairs, 2, 2, n), dtype=GENE_DTYPE)
+    children[:, 0] = np.where(swap, b, a)
+    children[:, 1] = np.where(swap, a, b)
+    children = children.reshape(2 * pairs, 2, n)[:m]
+
+    hit = rng.random((m, n)) < mut_rate
+    if timeslots_only:
+        hit_ts, hit_room = hit, np.zeros_like(hit)
+    else:
+        coin = rng.random((m, n)) < 0.5
+        hit_ts, hit_room = hit & coin, hit & ~coin
+    children[:, 0] = np.where(hit_ts, table.sample(table.ts, table.ts_len, rng, m), children[:, 0])
+    children[:, 1] = np.where(hit_room, table.sample(table.rooms, table.room_len, rng, m),
+                              children[:, 1])
+
+    genes = np.empty_like(pop.genes)
+    genes[:e] = pop.genes[np.asarray(elites, dtype=np.intp)]
+    genes[e:] = children
+
+    pairs_idx = np.stack([i1, i2], axis=1).tolist()
+    parents: List[Tuple[int, ...]] = [(i,) for i in elites]
+    for k in range(m):
+        p, q = pairs_idx[k // 2]
+        parents.append((p, q) if k % 2 == 0 else (q, p))
+    return Population(genes), parents
+
+
+@dataclass(frozen=True)
+class BestSnapshot:
+    """
+    Incumbent published by a solver whenever it improves. Holds a
+    read-only block (or an immutable tuple of assignments) that the solver
+    never touches again, so readers on other threads need no copy and
+    decode only when they ask for the individual.
+    """
+    version: int
+    step: int  # generation or epoch
+    penalty: Penalty
+    genes: Union[np.ndarray, Tuple[Assignment, ...]]
+    compiled: Optional[CompiledInstance] = None  # set when genes is an encoded block
+
+    @classmethod
+    def of_block(cls, version: int, step: int, penalty: Penalty, block: np.ndarray,
+                 ci: CompiledInstance) -> "BestSnapshot":
+        block.flags.writeable = False
+        return cls(version, step, penalty, block, ci)
+
+    @classmethod
+    def of_individual(cls, version: int, step: int, penalty: Penalty,
+                      ind: Individual) -> "BestSnapshot":
+        return cls(version, step, penalty, tuple(ind))
+
+    def individual(self) -> Individual:
+        if self.compiled is None:
+            return list(self.genes)
+        return decode(self.genes, self.compiled)
+
+
+BestCb = Callable[[BestSnapshot], None]
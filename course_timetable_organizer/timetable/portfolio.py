@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from timetable.models import Instance, Individual, Penalty
+from timetable.compiled import CompiledInstance, compile_instance
+from timetable.ga import GAConfig, HistoryRow, derive_seed, solve
+from timetable.localsearch import LSConfig, solve as ls_solve
+from timetable.population import GENE_DTYPE, BestSnapshot, decode, encode
+
+Member = Union[GAConfig, LSConfig]
+PortfolioRow = Tuple[float, int, int, int]  # (seconds, total, hard, soft)
+PortfolioProgressCb = Callable[[PortfolioRow], None]
+
+# shared incumbent (total, hard, soft), its encoded genes (2 * sessions)
+# and the stop settings, set per worker process
+_INCUMBENT = None
+_GENES = None
+_DEADLINE: Optional[float] = None
+_TARGET = 0
+_RESEED_AFTER = 0
+
+
+@dataclass(frozen=True)
+class PortfolioEntry:
+    member: int
+    config: Member
+    best: Individual
+    penalty: Penalty
+    history: List[HistoryRow]
+    seconds: float
+    stopped: str  # "target", "deadline", "raced" (another member hit target) or "done"
+
+
+def engine_of(member: Member) -> str:
+    return "ls" if isinstance(member, LSConfig) else "ga"
+
+
+def _init_member(incumbent, genes, deadline: Optional[float], target: int,
+                 reseed_after: int) -> None:
+    global _INCUMBENT, _GENES, _DEADLINE, _TARGET, _RESEED_AFTER
+    _INCUMBENT = incumbent
+    _GENES = genes
+    _DEADLINE = deadline
+    _TARGET = target
+    _RESEED_AFTER = reseed_after
+
+
+def _publish(ci: CompiledInstance, snap: BestSnapshot) -> None:
+    # GA snapshots hold an encoded block, local-search ones assignments
+    with _INCUMBENT.get_lock():
+        if snap.penalty.total < _INCUMBENT[0]:
+            p = snap.penalty
+            _INCUMBENT[0], _INCUMBENT[1], _INCUMBENT[2] = p.total, p.hard, p.soft
+            block = snap.genes if snap.compiled is not None else encode(list(snap.genes), ci)
+            _GENES[:] = block.ravel().tolist()
+
+
+def _incumbent(ci: CompiledInstance) -> Individual:
+    with _INCUMBENT.get_lock():
+        genes = np.array(_GENES[:], dtype=GENE_DTYPE)
+    return decode(genes.reshape(2, -1), ci)
+
+
+def _should_stop(pen: Penalty) -> bool:
+    if _INCUMBENT[0] <= _TARGET:
+        return True
+    return _DEADLINE is not None and time.time() >= _DEADLINE
+
+
+class _Watch:
+    """should_stop for one run of a member: also ends it to re-seed once it stalls."""
+
+    def __init__(self) -> None:
+        self.best: Optional[int] = None
+        self.idle = 0
+        self.reseed = False
+
+    def __call__(self, pen: Penalty) -> bool:
+        if _should_stop(pen):
+            return True
+        if self.best is None or pen.total < self.best:
+            self.best, self.idle = pen.total, 0
+        else:
+            self.idle += 1
+        if _RESEED_AFTER and self.idle >= _RESEED_AFTER and _INCUMBENT[0] < self.best:
+            self.reseed = True
+        return self.reseed
+
+
+def _run_member(member: Member, inst: Instance, seeds: Optional[List[Individual]]):
+    start = time.time()
+    ci = compile_instance(inst)
+    is_ls = isinstance(member, LSConfig)
+    budget = member.epochs if is_ls else member.generations
+    publish = partial(_publish, ci)
+
+    best: Optional[Individual] = None
+    pen: Optional[Penalty] = None
+    hist: List[HistoryRow] = []
+    done = 0  # generations / epochs run so far
+    run = 0
+    while True:
+        # a re-seeded run continues the budget on fresh random streams
+        cfg = member if run == 0 else replace(
+            member, seed=derive_seed(member.seed, "reseed", run),
+            **{"epochs" if is_ls else "generations": budget - done})
+        watch = _Watch()
+        final: List[List[Individual]] = []
+        if is_ls:
+            b, p, h = ls_solve(inst, cfg, seeds=seeds, should_stop=watch, best_cb=publish)
+        else:
+            b, p, h = solve(inst, cfg, seeds=seeds, should_stop=watch, best_cb=publish,
+                            population_cb=final.append)
+        hist += h if run == 0 else [(g + done, *row) for g, *row in h[1:]]
+        if pen is None or p.total < pen.total:
+            best, pen = b, p
+        done += len(h) - 1
+        if not watch.reseed or done >= budget:
+            break
+
+        # stalled behind another member: carry on from the incumbent
+        inc = _incumbent(ci)
+        seeds = [inc] if is_ls else [inc] + final[0][:-1]
+        run += 1
+
+    if pen.total <= _TARGET:
+        stopped = "target"
+    elif _INCUMBENT[0] <= _TARGET:
+        stopped = "raced"
+    elif _DEADLINE is not None and time.time() >= _DEADLINE:
+        stopped = "deadline"
+    else:
+        stopped = "done"
+    return best, pen, hist, time.time() - start, stopped
+
+
+def portfolio(
+    inst: Instance,
+    members: Sequence[Member],
+    *,
+    target: int = 0,
+    time_limit: Optional[float] = None,
+    workers: int = 1,
+    progress_cb: Optional[PortfolioProgressCb] = None,
+    seeds: Optional[Sequence[Individual]] = None,
+    poll: float = 0.5,
+    reseed_after: int = 50,
+) -> List[PortfolioEntry]:
+    """
+    Race several GA / local-search configurations on the same instance,
+    one process per member (at most `workers` at a time).
+
+    Members publish each new best (penalty and schedule) into a shared
+    incumbent. A member whose own best has not improved for
+    `reseed_after` generations or epochs while the incumbent is better
+    restarts from the incumbent for the rest of its budget: a GA swaps it
+    into its last population, local search starts from it (0 disables
+    this). All of them stop as soon as the incumbent reaches
+    `target` or `time_limit` seconds have passed; members still queued at
+    that point return after their first generation. progress_cb receives
+    the incumbent every `poll` seconds and once more at the end. Returns
+    entries ranked best first.
+    """
+    if not members:
+        raise ValueError("members must not be empty.")
+    if workers <= 0:
+        raise ValueError("workers must be >= 1.")
+    if time_limit is not None and time_limit <= 0:
+        raise ValueError("time_limit must be > 0.")
+    if reseed_after < 0:
+        raise ValueError("reseed_after must be >= 0.")
+
+    # members run single-process and quiet; the portfolio owns the cores
+    configs = [replace(m, log_every=0) if isinstance(m, LSConfig)
+               else replace(m, log_every=0, workers=1) for m in members]
+    seeds = [list(ind) for ind in seeds] if seeds else None
+
+    ctx = mp.get_context("spawn")
+    incumbent = ctx.Array("q", [2**62, 0, 0])
+    genes = ctx.Array("i", 2 * len(inst.sessions))
+    start = time.time()
+    deadline = start + time_limit if time_limit is not None else None
+
+    def emit() -> None:
+        if progress_cb is not None:
+            with incumbent.get_lock():
+                total, hard, soft = incumbent[:]
+            if total < 2**62:
+                progress_cb((round(time.time() - start, 2), total, hard, soft))
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(configs)),
+        mp_context=ctx,
+        initializer=_init_member,
+        initargs=(incumbent, genes, deadline, target, reseed_after),
+    ) as ex:
+        futures = [ex.submit(_run_member, cfg, inst, seeds) for cfg in configs]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+            emit()
+        results = [f.result() for f in futures]
+    emit()
+
+    entries = [
+        PortfolioEntry(member=k, config=members[k], best=best, penalty=pen,
+                       history=hist, seconds=secs, stopped=stopped)
+        for k, (best, pen, hist, secs, stopped) in enumerate(results)
+    ]
+    return sorted(entries, key=lambda e: (e.penalty.total, e.seconds))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from timetable.models import Instance
+from timetable.domains import Domains, compute_domains
+
+
+@dataclass(frozen=True)
+class Defect:
+    kind: str       # "room", "teacher" or "group"
+    subject: str
+    sessions: int   # sessions competing for the resource
+    capacity: int   # what the resource can hold without a violation
+    penalty: int    # hard violations forced by the shortfall
+    message: str
+
+
+@dataclass(frozen=True)
+class Preflight:
+    hard_lower_bound: int
+    defects: List[Defect]
+    notes: List[str]  # propagation defects from compute_domains; not part of the bound
+
+    @property
+    def infeasible(self) -> bool:
+        """Proven: no timetable is free of hard violations. A zero bound proves nothing."""
+        return self.hard_lower_bound > 0
+
+
+def preflight(inst: Instance, domains: Optional[Domains] = None) -> Preflight:
+    """
+    Counting lower bound on the hard penalty of any timetable, with the
+    defects that force it. Each argument charges its own penalty terms, so
+    the per-defect penalties add up:
+
+    - rooms: of the sessions of one room type, at most min(timeslots x
+      rooms of that type, sessions fitting such a room) can sit in a room
+      of the type that is large enough without colliding; every other one
+      pays a room-type, capacity or room-collision violation;
+    - teacher: sessions beyond the teacher's available slots pay an
+      availability violation or a teacher collision each;
+    - group: sessions beyond the number of timeslots pay a group collision.
+    """
+    n_ts = len(inst.timeslots)
+    defects: List[Defect] = []
+
+    rooms_of_type = Counter(r.rtype for r in inst.rooms.values())
+    largest: Dict[str, int] = {}
+    for r in inst.rooms.values():
+        largest[r.rtype] = max(largest.get(r.rtype, 0), r.capacity)
+    for rtype, k in sorted(Counter(s.rtype for s in inst.sessions).items()):
+        fitting = sum(1 for s in inst.sessions
+                      if s.rtype == rtype and s.size <= largest.get(rtype, -1))
+        slots = n_ts * rooms_of_type[rtype]
+        cap = min(slots, fitting)
+        if k > cap:
+            why = []
+            if fitting < k:
+                why.append(f"{k - fitting} fit no {rtype} room")
+            if slots < k:
+                why.append(f"{rooms_of_type[rtype]} {rtype} rooms x {n_ts} timeslots")
+            defects.append(Defect(
+                "room", rtype, k, cap, k - cap,
+                f"{k} {rtype} sessions: " + ", ".join(why)))
+
+    slot_ids = {t.id for t in inst.timeslots}
+    for teacher, k in sorted(Counter(s.teacher for s in inst.sessions).items()):
+        av = inst.teacher_availability.get(teacher)
+        cap = n_ts if av is None else len(slot_ids & set(av))
+        if k > cap:
+            defects.append(Defect(
+                "teacher", teacher, k, cap, k - cap,
+                f"teacher {teacher}: {k} sessions but {cap} available timeslots"))
+
+    per_group = Counter(g for s in inst.sessions for g in s.groups)
+    for g, k in sorted(per_group.items()):
+        if k > n_ts:
+            defects.append(Defect(
+                "group", g, k, n_ts, k - n_ts,
+                f"group {g}: {k} sessions but {n_ts} timeslots"))
+
+    if domains is None:
+        domains = compute_domains(inst)
+    return Preflight(
+        hard_lower_bound=sum(d.penalty for d in defects),
+        defects=defects,
+        notes=list(domains.defects),
+    )
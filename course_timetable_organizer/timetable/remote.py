@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+import socket
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from multiprocessing.managers import BaseManager
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# shared secret of broker, workers and pools; required, as every payload
+# is unpickled: whoever holds the key can run code on the other side
+AUTHKEY_ENV = "TIMETABLE_BROKER_KEY"
+
+# the broker only stores pickled bytes, so it never needs the solver code:
+# task (task id, pool id, pickled (fn, chunk)), outcome pickled (ok, values or traceback)
+Task = Tuple[str, str, bytes]
+
+
+def authkey() -> bytes:
+    key = os.environ.get(AUTHKEY_ENV, "")
+    if not key:
+        raise RuntimeError(f"Set {AUTHKEY_ENV} to a shared secret before starting a broker, "
+                           "worker or remote pool.")
+    return key.encode()
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"broker address must be host:port, got {address!r}.")
+    return host, int(port)
+
+
+class Broker:
+    """
+    Task queue with leases, living in the broker process. Every method is
+    called over a manager connection, one thread per client, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._setups: Dict[str, bytes] = {}  # pool id -> pickled (initializer, initargs)
+        self._pending: Deque[Task] = deque()
+        self._leased: Dict[str, Tuple[Task, str, float]] = {}  # task id -> (task, worker, deadline)
+        self._done: Dict[str, bytes] = {}
+        self._seen: Dict[str, float] = {}  # worker -> last contact
+
+    def open(self, pool_id: str, setup: bytes) -> None:
+        with self._lock:
+            self._setups[pool_id] = setup
+
+    def close(self, pool_id: str) -> None:
+        with self._lock:
+            self._setups.pop(pool_id, None)
+            self._pending = deque(t for t in self._pending if t[1] != pool_id)
+            for tid in [tid for tid, (t, _, _) in self._leased.items() if t[1] == pool_id]:
+                del self._leased[tid]
+            for tid in [tid for tid in self._done if tid.startswith(pool_id)]:
+                del self._done[tid]
+
+    def setup(self, pool_id: str) -> Optional[bytes]:
+        with self._lock:
+            return self._setups.get(pool_id)
+
+    def submit(self, tasks: List[Task]) -> None:
+        with self._lock:
+            self._pending.extend(tasks)
+
+    def lease(self, worker: str, max_tasks: int, seconds: float) -> List[Task]:
+        now = time.time()
+        with self._lock:
+            self._seen[worker] = now
+            for tid, (task, _, deadline) in list(self._leased.items()):
+                if deadline < now:
+                    del self._leased[tid]
+                    self._pending.appendleft(task)
+            out: List[Task] = []
+            while self._pending and len(out) < max_tasks:
+                task = self._pending.popleft()
+                if task[1] in self._setups:
+                    self._leased[task[0]] = (task, worker, now + seconds)
+                    out.append(task)
+            return out
+
+    def renew(self, worker: str, seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._seen[worker] = now
+            for tid, (task, who, _) in self._leased.items():
+                if who == worker:
+                    self._leased[tid] = (task, who, now + seconds)
+
+    def complete(self, worker: str, task_id: str, outcome: bytes) -> None:
+        with self._lock:
+            self._seen[worker] = time.time()
+            # a requeued task may finish twice; the first result stands
+            if self._leased.pop(task_id, None) is not None or any(
+                    t[0] == task_id for t in self._pending):
+                self._pending = deque(t for t in self._pending if t[0] != task_id)
+                self._done.setdefault(task_id, outcome)
+
+    def collect(self, task_ids: List[str]) -> Dict[str, bytes]:
+        with self._lock:
+            return {tid: self._done.pop(tid) for tid in task_ids if tid in self._done}
+
+    def workers(self, within: float) -> List[str]:
+        cutoff = time.time() - within
+        with self._lock:
+            return sorted(w for w, t in self._seen.items() if t >= cutoff)
+
+
+_BROKER: Optional[Broker] = None
+
+
+def _broker() -> Broker:
+    global _BROKER
+    if _BROKER is None:
+        _BROKER = Broker()
+    return _BROKER
+
+
+class BrokerManager(BaseManager):
+    pass
+
+
+BrokerManager.register("broker", callable=_broker)
+
+
+def connect(address: str):
+    mgr = BrokerManager(address=parse_address(address), authkey=authkey())
+    mgr.connect()
+    return mgr.broker()
+
+
+class RemotePool:
+    """
+    multiprocessing.Pool look-alike whose tasks run on the workers of the
+    broker at `address` ("host:port"). `initializer(*initargs)` runs once
+    per worker before its first task from this pool. Workers renew their
+    leases while working; chunks of a worker that stops renewing go to
+    the next worker that asks. map() raises if no worker has been in
+    contact for `lease` seconds while results are outstanding.
+    """
+
+    def __init__(self, address: str, initializer: Callable[..., None], initargs: tuple = (),
+                 *, lease: float = 30.0, poll: float = 0.02):
+        if lease <= 0:
+            raise ValueError("lease must be > 0.")
+        self.lease = lease
+        self.poll = poll
+        self._id = uuid.uuid4().hex
+        self._broker = connect(address)
+        self._broker.open(self._id, pickle.dumps((initializer, tuple(initargs))))
+        self._closed = False
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any], chunksize: int = 1) -> List[Any]:
+        if self._closed:
+            raise ValueError("Pool is closed.")
+        items = list(items)
+        chunksize = max(1, chunksize)
+        chunks = [items[k:k + chunksize] for k in range(0, len(items), chunksize)]
+        ids = [f"{self._id}:{uuid.uuid4().hex}" for _ in chunks]
+        self._broker.submit([(tid, self._id, pickle.dumps((fn, chunk)))
+                             for tid, chunk in zip(ids, chunks)])
+
+        results: Dict[str, List[Any]] = {}
+        waiting = list(ids)
+        last_progress = time.time()
+        while waiting:
+            got = self._broker.collect(waiting)
+            for tid, outcome in got.items():
+                ok, value = pickle.loads(outcome)
+                if not ok:
+                    raise RuntimeError(f"Remote task failed:\n{value}")
+                results[tid] = value
+            if got:
+                waiting = [tid for tid in waiting if tid not in results]
+                last_progress = time.time()
+            elif time.time() - last_progress > self.lease and not self._broker.workers(self.lease):
+                raise RuntimeError("No remote workers reachable.")
+            else:
+                time.sleep(self.poll)
+        return [value for tid in ids for value in results[tid]]
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._broker.close(self._id)
+
+    def join(self) -> None:
+        pass
+
+
+def run_worker(address: str, *, batch: int = 1, lease: float = 30.0, idle: float = 0.05) -> None:
+    """Serve tasks from the broker at `address` until interrupted."""
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    broker = connect(address)
+    current: Optional[str] = None
+    stop = threading.Event()
+
+    def keep_leases() -> None:
+        # own connection: proxies are not shared between threads
+        renewer = connect(address)
+        while not stop.wait(lease / 3):
+            renewer.renew(worker, lease)
+
+    threading.Thread(target=keep_leases, daemon=True).start()
+    try:
+        while True:
+            tasks: Sequence[Task] = broker.lease(worker, batch, lease)
+            if not tasks:
+                time.sleep(idle)
+                continue
+            for task_id, pool_id, payload in tasks:
+                try:
+                    if pool_id != current:
+                        setup = broker.setup(pool_id)
+                        if setup is None:
+                            continue  # pool closed meanwhile
+                        initializer, initargs = pickle.loads(setup)
+                        initializer(*initargs)
+                        current = pool_id
+                    fn, chunk = pickle.loads(payload)
+                    outcome: Tuple[bool, Any] = (True, [fn(item) for item in chunk])
+                except Exception:
+                    outcome = (False, traceback.format_exc())
+                broker.complete(worker, task_id, pickle.dumps(outcome))
+    finally:
+        stop.set()
+
+
+def serve_broker(bind: str) -> None:
+    """Run the broker in the foreground."""
+    mgr = BrokerManager(address=parse_address(bind), authkey=authkey())
+    mgr.get_server().serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m timetable.remote")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("broker", help="run the task broker")
+    b.add_argument("--bind", default="127.0.0.1:50000",
+                   help="host:port; keep it on a private network or loopback")
+    w = sub.add_parser("worker", help="serve tasks from a broker")
+    w.add_argument("--broker", default="127.0.0.1:50000")
+    w.add_argument("--batch", type=int, default=1, help="chunks leased at a time")
+    w.add_argument("--lease", type=float, default=30.0, help="seconds before unrenewed work is requeued")
+    args = parser.parse_args(argv)
+    try:
+        authkey()
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    if args.cmd == "broker":
+        serve_broker(args.bind)
+    else:
+        run_worker(args.broker, batch=args.batch, lease=args.lease)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
 from __future__ import annotations
 from typing import DefaultDict, Tuple
 
+import copy
 import random
+from array import array
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import DefaultDict, Dict, List, Sequence, Set, Tuple
+from typing import DefaultDict, Dict, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
+
+from timetable import kernels as _kernels
 from timetable.models import Instance, Individual
+from timetable.compiled import CompiledInstance, compile_instance
+from timetable.domains import Domains, compute_domains
+
+REPAIR_MODES = ("sample", "best")
+TRACKERS = ("dict", "flat")
 
 
 @dataclass(frozen=True)
@@ -26,6 +36,12 @@ class HardConstraintTracker:
 
     hard_penalty = unary_total + room_collision_total + teacher_collision_total + group_collision_total
     where each collision group contributes sum(max(0, count-1)).
+
+    It also keeps the live set of violating sessions. A session's weight is
+    its unary penalty plus the number of colliding keys it sits in. Besides
+    the count, every key stores the sum of its member indices, so when a
+    key drops to (or rises from) a single member that member is known
+    without storing member lists.
     """
 
     def __init__(self, ind: Individual, inst: Instance):
@@ -37,6 +53,14 @@ class HardConstraintTracker:
             int)
         self._group_count: DefaultDict[Tuple[str, str], int] = defaultdict(int)
 
+        self._room_sum: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+        self._teacher_sum: DefaultDict[Tuple[str, str], int] = defaultdict(
+            int)
+        self._group_sum: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+
+        self._viol: List[int] = [0] * len(inst.sessions)
+        self._bad: Set[int] = set()
+
         self._room_coll = 0
         self._teacher_coll = 0
         self._group_coll = 0
@@ -49,6 +73,22 @@ class HardConstraintTracker:
             u = self._unary_for(i, ts, room)
             self._unary_by_idx[i] = u
             self._unary_total += u
+            self._bump_viol(i, u)
+
+    def copy(self) -> "HardConstraintTracker":
+        """Independent tracker in the same state, without rebuilding it."""
+        new = copy.copy(self)
+        new.ind = self.ind[:]
+        new._room_count = self._room_count.copy()
+        new._teacher_count = self._teacher_count.copy()
+        new._group_count = self._group_count.copy()
+        new._room_sum = self._room_sum.copy()
+        new._teacher_sum = self._teacher_sum.copy()
+        new._group_sum = self._group_sum.copy()
+        new._viol = self._viol[:]
+        new._bad = set(self._bad)
+        new._unary_by_idx = self._unary_by_idx[:]
+        return new
 
     def hard(self) -> int:
         return self._unary_total + self._room_coll + self._teacher_coll + self._group_coll
@@ -56,9 +96,94 @@ class HardConstraintTracker:
     def unary_for_idx(self, idx: int) -> int:
         return self._unary_by_idx[idx]
 
+    def violation(self, idx: int) -> int:
+        return self._viol[idx]
+
+    def conflicts(self) -> Set[int]:
+        """Live set of violating session indices; copy it before moving."""
+        return self._bad
+
+    def conflicts_by_weight(self, rng: random.Random) -> List[int]:
+        """Violating sessions, heaviest first, random order among equals."""
+        bad = sorted(self._bad)
+        rng.shuffle(bad)
+        bad.sort(key=self._viol.__getitem__, reverse=True)
+        return bad
+
     def assignment(self, idx: int) -> Tuple[str, str]:
         return self.ind[idx]
 
+    def occupant(self, ts: str, room_id: str) -> Optional[int]:
+        """The session in (ts, room) if it holds exactly one, else None."""
+        if self._room_count.get((ts, room_id), 0) == 1:
+            return self._room_sum[(ts, room_id)]
+        return None
+
+    def move_delta(self, idx: int, new_ts: str, new_room: str) -> int:
+        """hard() change if `idx` moved to (new_ts, new_room); nothing is applied."""
+        old_ts, old_room = self.ind[idx]
+        if old_ts == new_ts and old_room == new_room:
+            return 0
+
+        d = self._unary_for(idx, new_ts, new_room) - self._unary_by_idx[idx]
+
+        if self._room_count[(old_ts, old_room)] > 1:
+            d -= 1
+        if self._room_count.get((new_ts, new_room), 0) >= 1:
+            d += 1
+
+        if old_ts != new_ts:
+            s = self.inst.sessions[idx]
+            if self._teacher_count[(old_ts, s.teacher)] > 1:
+                d -= 1
+            if self._teacher_count.get((new_ts, s.teacher), 0) >= 1:
+                d += 1
+            for g in s.groups:
+                if self._group_count[(old_ts, g)] > 1:
+                    d -= 1
+                if self._group_count.get((new_ts, g), 0) >= 1:
+                    d += 1
+
+        return d
+
+    def swap_delta(self, i: int, j: int) -> int:
+        """hard() change if sessions i and j exchanged assignments."""
+        ts_i, room_i = self.ind[i]
+        ts_j, room_j = self.ind[j]
+        return self._changes_delta([(i, ts_j, room_j), (j, ts_i, room_i)])
+
+    def _changes_delta(self, changes: Sequence[Tuple[int, str, str]]) -> int:
+        counts = {"room": self._room_count,
+                  "teacher": self._teacher_count, "group": self._group_count}
+        net: Dict[Tuple[str, Tuple[str, str]], int] = defaultdict(int)
+        d = 0
+
+        for idx, ts, room_id in changes:
+            old_ts, old_room = self.ind[idx]
+            s = self.inst.sessions[idx]
+            d += self._unary_for(idx, ts, room_id) - self._unary_by_idx[idx]
+
+            net[("room", (old_ts, old_room))] -= 1
+            net[("room", (ts, room_id))] += 1
+            net[("teacher", (old_ts, s.teacher))] -= 1
+            net[("teacher", (ts, s.teacher))] += 1
+            for g in s.groups:
+                net[("group", (old_ts, g))] -= 1
+                net[("group", (ts, g))] += 1
+
+        for (which, key), delta in net.items():
+            if delta:
+                c = counts[which].get(key, 0)
+                d += self._penalty_from_count(c + delta) - \
+                    self._penalty_from_count(c)
+        return d
+
+    def swap(self, i: int, j: int) -> None:
+        ts_i, room_i = self.ind[i]
+        ts_j, room_j = self.ind[j]
+        self.move(i, ts_j, room_j)
+        self.move(j, ts_i, room_i)
+
     def move(self, idx: int, new_ts: str, new_room: str) -> _MoveToken:
         old_ts, old_room = self.ind[idx]
         if old_ts == new_ts and old_room == new_room:
@@ -71,6 +196,7 @@ class HardConstraintTracker:
         new_u = self._unary_for(idx, new_ts, new_room)
         self._unary_by_idx[idx] = new_u
         self._unary_total += (new_u - old_u)
+        self._bump_viol(idx, new_u - old_u)
 
         self.ind[idx] = (new_ts, new_room)
         return _MoveToken(idx=idx, old_ts=old_ts, old_room=old_room)
@@ -102,12 +228,46 @@ class HardConstraintTracker:
     def _penalty_from_count(c: int) -> int:
         return c - 1 if c > 1 else 0
 
-    def _bump_count(self, mp: DefaultDict[Tuple[str, str], int], key: Tuple[str, str], delta: int, which: str) -> None:
+    def _bump_viol(self, idx: int, delta: int) -> None:
+        if not delta:
+            return
+        v = self._viol[idx] + delta
+        self._viol[idx] = v
+        if v:
+            self._bad.add(idx)
+        else:
+            self._bad.discard(idx)
+
+    def _bump_count(
+        self,
+        mp: DefaultDict[Tuple[str, str], int],
+        sums: DefaultDict[Tuple[str, str], int],
+        key: Tuple[str, str],
+        idx: int,
+        delta: int,
+        which: str,
+    ) -> None:
         before = mp[key]
         after = before + delta
         if after < 0:
             raise ValueError("Count underflow for key=%s" % (key,))
 
+        sum_before = sums[key]
+        sum_after = sum_before + delta * idx
+        if delta > 0 and after >= 2:
+            self._bump_viol(idx, 1)
+            if after == 2:
+                self._bump_viol(sum_before, 1)  # the previous sole member
+        elif delta < 0 and before >= 2:
+            self._bump_viol(idx, -1)
+            if after == 1:
+                self._bump_viol(sum_after, -1)  # the remaining member
+
+        if after == 0:
+            del sums[key]
+        else:
+            sums[key] = sum_after
+
         pb = self._penalty_from_count(before)
         pa = self._penalty_from_count(after)
 
@@ -127,17 +287,287 @@ class HardConstraintTracker:
 
     def _add_collision(self, idx: int, ts: str, room_id: str) -> None:
         s = self.inst.sessions[idx]
-        self._bump_count(self._room_count, (ts, room_id), +1, "room")
-        self._bump_count(self._teacher_count, (ts, s.teacher), +1, "teacher")
+        self._bump_count(self._room_count, self._room_sum,
+                         (ts, room_id), idx, +1, "room")
+        self._bump_count(self._teacher_count, self._teacher_sum,
+                         (ts, s.teacher), idx, +1, "teacher")
         for g in s.groups:
-            self._bump_count(self._group_count, (ts, g), +1, "group")
+            self._bump_count(self._group_count, self._group_sum,
+                             (ts, g), idx, +1, "group")
 
     def _remove_collision(self, idx: int, ts: str, room_id: str) -> None:
         s = self.inst.sessions[idx]
-        self._bump_count(self._room_count, (ts, room_id), -1, "room")
-        self._bump_count(self._teacher_count, (ts, s.teacher), -1, "teacher")
+        self._bump_count(self._room_count, self._room_sum,
+                         (ts, room_id), idx, -1, "room")
+        self._bump_count(self._teacher_count, self._teacher_sum,
+                         (ts, s.teacher), idx, -1, "teacher")
         for g in s.groups:
-            self._bump_count(self._group_count, (ts, g), -1, "group")
+            self._bump_count(self._group_count, self._group_sum,
+                             (ts, g), idx, -1, "group")
+
+
+class FlatHardConstraintTracker:
+    """
+    Same penalty semantics and interface as HardConstraintTracker, backed
+    by flat integer arrays over a CompiledInstance:
+
+      room key    = ts * n_rooms + room
+      teacher key = ts * n_teachers + teacher
+      group key   = ts * n_groups + group
+
+    Moves and undos allocate nothing; the undo token is the packed
+    (idx, old_ts, old_room) integer. With kernels="numba" the "best" repair
+    step scans its candidates in one compiled call over NumPy views of
+    these arrays.
+    """
+
+    __slots__ = (
+        "inst", "ci", "_ts", "_room", "_nr", "_nt", "_ng", "_n_ts",
+        "_room_count", "_room_sum", "_teacher_count", "_teacher_sum",
+        "_group_count", "_group_sum", "_coll", "_unary_by_idx",
+        "_unary_total", "_viol", "_bad", "_views",
+    )
+
+    def __init__(
+        self,
+        ind: Optional[Individual],
+        inst: Instance,
+        ci: Optional[CompiledInstance] = None,
+        *,
+        encoded: Optional[Tuple[array, array]] = None,
+        kernels: str = "python",
+    ):
+        # `encoded` adopts ready (timeslot, room) index arrays instead of `ind`
+        self.inst = inst
+        self.ci = ci = ci if ci is not None else compile_instance(inst)
+        self._ts, self._room = encoded if encoded is not None else ci.encode(ind)
+
+        self._n_ts = ci.n_ts
+        self._nr = max(1, ci.n_rooms)
+        self._nt = max(1, ci.n_teachers)
+        self._ng = max(1, ci.n_groups)
+
+        self._room_count = array("i", bytes(4 * self._n_ts * self._nr))
+        self._room_sum = array("q", bytes(8 * self._n_ts * self._nr))
+        self._teacher_count = array("i", bytes(4 * self._n_ts * self._nt))
+        self._teacher_sum = array("q", bytes(8 * self._n_ts * self._nt))
+        self._group_count = array("i", bytes(4 * self._n_ts * self._ng))
+        self._group_sum = array("q", bytes(8 * self._n_ts * self._ng))
+        self._coll = 0
+
+        n = len(inst.sessions)
+        self._unary_by_idx = array("i", bytes(4 * n))
+        self._unary_total = 0
+        self._viol = array("i", bytes(4 * n))
+        self._bad: Set[int] = set()
+
+        for i in range(n):
+            t, r = self._ts[i], self._room[i]
+            self._add(i, t, r)
+            u = self._unary(i, t, r)
+            self._unary_by_idx[i] = u
+            self._unary_total += u
+            self._bump_viol(i, u)
+
+        self._views = None
+        if kernels == "numba":
+            self._views = _kernels.tracker_views(
+                self._ts, self._room, self._unary_by_idx, self._room_count,
+                self._room_sum, self._teacher_count, self._group_count)
+
+    @property
+    def ind(self) -> Individual:
+        return self.ci.decode(self._ts, self._room)
+
+    @property
+    def accelerated(self) -> bool:
+        return self._views is not None
+
+    def arrays(self) -> Tuple[array, array]:
+        """The live (timeslot, room) index arrays; copy before keeping them."""
+        return self._ts, self._room
+
+    def hard(self) -> int:
+        return self._unary_total + self._coll
+
+    def unary_for_idx(self, idx: int) -> int:
+        return self._unary_by_idx[idx]
+
+    def violation(self, idx: int) -> int:
+        return self._viol[idx]
+
+    def conflicts(self) -> Set[int]:
+        return self._bad
+
+    def conflicts_by_weight(self, rng: random.Random) -> List[int]:
+        bad = sorted(self._bad)
+        rng.shuffle(bad)
+        bad.sort(key=self._viol.__getitem__, reverse=True)
+        return bad
+
+    def assignment(self, idx: int) -> Tuple[str, str]:
+        return self.ci.timeslot_ids[self._ts[idx]], self.ci.room_ids[self._room[idx]]
+
+    def occupant(self, ts: str, room_id: str) -> Optional[int]:
+        k = self.ci.ts_index[ts] * self._nr + self.ci.room_index[room_id]
+        if self._room_count[k] == 1:
+            return self._room_sum[k]
+        return None
+
+    def move(self, idx: int, new_ts: str, new_room: str) -> int:
+        t0, r0 = self._ts[idx], self._room[idx]
+        self._move(idx, self.ci.ts_index[new_ts],
+                   self.ci.room_index[new_room])
+        return (idx * self._n_ts + t0) * self._nr + r0
+
+    def undo(self, token: int) -> None:
+        rest, r0 = divmod(token, self._nr)
+        idx, t0 = divmod(rest, self._n_ts)
+        self._move(idx, t0, r0)
+
+    def swap(self, i: int, j: int) -> None:
+        ti, ri, tj, rj = self._ts[i], self._room[i], self._ts[j], self._room[j]
+        self._move(i, tj, rj)
+        self._move(j, ti, ri)
+
+    def move_delta(self, idx: int, new_ts: str, new_room: str) -> int:
+        t1 = self.ci.ts_index[new_ts]
+        r1 = self.ci.room_index[new_room]
+        t0, r0 = self._ts[idx], self._room[idx]
+        if t0 == t1 and r0 == r1:
+            return 0
+
+        d = self._unary(idx, t1, r1) - self._unary_by_idx[idx]
+        nr = self._nr
+        if self._room_count[t0 * nr + r0] > 1:
+            d -= 1
+        if self._room_count[t1 * nr + r1] >= 1:
+            d += 1
+
+        if t0 != t1:
+            nt, ng = self._nt, self._ng
+            te = self.ci.sess_teacher[idx]
+            if self._teacher_count[t0 * nt + te] > 1:
+                d -= 1
+            if self._teacher_count[t1 * nt + te] >= 1:
+                d += 1
+            for g in self.ci.sess_groups[idx]:
+                if self._group_count[t0 * ng + g] > 1:
+                    d -= 1
+                if self._group_count[t1 * ng + g] >= 1:
+                    d += 1
+
+        return d
+
+    def swap_delta(self, i: int, j: int) -> int:
+        ti, ri, tj, rj = self._ts[i], self._room[i], self._ts[j], self._room[j]
+        d = (self._unary(i, tj, rj) - self._unary_by_idx[i]
+             + self._unary(j, ti, ri) - self._unary_by_idx[j])
+        if ti == tj:
+            return d  # rooms are exchanged within one timeslot; counts stay
+
+        # room keys swap occupants one-for-one; only teacher/group keys move
+        net: Dict[Tuple[int, int], int] = defaultdict(int)
+        nt, ng = self._nt, self._ng
+        for idx, t_from, t_to in ((i, ti, tj), (j, tj, ti)):
+            te = self.ci.sess_teacher[idx]
+            net[(0, t_from * nt + te)] -= 1
+            net[(0, t_to * nt + te)] += 1
+            for g in self.ci.sess_groups[idx]:
+                net[(1, t_from * ng + g)] -= 1
+                net[(1, t_to * ng + g)] += 1
+
+        counts = (self._teacher_count, self._group_count)
+        for (which, k), delta in net.items():
+            if delta:
+                c = counts[which][k]
+                d += max(0, c + delta - 1) - max(0, c - 1)
+        return d
+
+    def best_step(self, idx: int, ts_choices: List[str], room_choices: List[str]) -> None:
+        """_best_step() as one compiled scan; needs kernels="numba"."""
+        ci = self.ci
+        cand_ts = np.array([ci.ts_index[t] for t in ts_choices], dtype=np.intc)
+        cand_rooms = np.array([ci.room_index[r] for r in room_choices], dtype=np.intc)
+        ts, rooms, unary, room_count, room_sum, teacher_count, group_count = self._views
+        _, kind, a, b = _kernels.best_step(
+            idx, cand_ts, cand_rooms, ts, rooms, unary, room_count, room_sum,
+            teacher_count, group_count, ci.sess_teacher_np, ci.member_ptr,
+            ci.member_group, ci.sess_small_room, ci.sess_wrong_type, ci.sess_avail,
+            self._nr, self._nt, self._ng)
+        if kind == _kernels.SWAP:
+            self.swap(idx, int(a))
+        elif kind == _kernels.MOVE:
+            self._move(idx, int(a), int(b))
+
+    def _unary(self, idx: int, t: int, r: int) -> int:
+        ci = self.ci
+        u = (ci.room_cap[r] < ci.sess_size[idx]) + \
+            (ci.room_rtype[r] != ci.sess_rtype[idx])
+        if not (ci.teacher_avail[ci.sess_teacher[idx]] >> t) & 1:
+            u += 1
+        return u
+
+    def _move(self, idx: int, t1: int, r1: int) -> None:
+        t0, r0 = self._ts[idx], self._room[idx]
+        if t0 == t1 and r0 == r1:
+            return
+        self._remove(idx, t0, r0)
+        self._add(idx, t1, r1)
+
+        old_u = self._unary_by_idx[idx]
+        new_u = self._unary(idx, t1, r1)
+        self._unary_by_idx[idx] = new_u
+        self._unary_total += new_u - old_u
+        self._bump_viol(idx, new_u - old_u)
+
+        self._ts[idx] = t1
+        self._room[idx] = r1
+
+    def _bump_viol(self, idx: int, delta: int) -> None:
+        if not delta:
+            return
+        v = self._viol[idx] + delta
+        self._viol[idx] = v
+        if v:
+            self._bad.add(idx)
+        else:
+            self._bad.discard(idx)
+
+    def _inc(self, counts: array, sums: array, k: int, idx: int) -> None:
+        c = counts[k] + 1
+        counts[k] = c
+        if c >= 2:
+            self._coll += 1
+            self._bump_viol(idx, 1)
+            if c == 2:
+                self._bump_viol(sums[k], 1)  # the previous sole member
+        sums[k] += idx
+
+    def _dec(self, counts: array, sums: array, k: int, idx: int) -> None:
+        c = counts[k] - 1
+        counts[k] = c
+        rest = sums[k] - idx
+        sums[k] = rest
+        if c >= 1:
+            self._coll -= 1
+            self._bump_viol(idx, -1)
+            if c == 1:
+                self._bump_viol(rest, -1)  # the remaining member
+
+    def _add(self, idx: int, t: int, r: int) -> None:
+        self._inc(self._room_count, self._room_sum, t * self._nr + r, idx)
+        self._inc(self._teacher_count, self._teacher_sum,
+                  t * self._nt + self.ci.sess_teacher[idx], idx)
+        for g in self.ci.sess_groups[idx]:
+            self._inc(self._group_count, self._group_sum, t * self._ng + g, idx)
+
+    def _remove(self, idx: int, t: int, r: int) -> None:
+        self._dec(self._room_count, self._room_sum, t * self._nr + r, idx)
+        self._dec(self._teacher_count, self._teacher_sum,
+                  t * self._nt + self.ci.sess_teacher[idx], idx)
+        for g in self.ci.sess_groups[idx]:
+            self._dec(self._group_count, self._group_sum, t * self._ng + g, idx)
 
 
 def hard_penalty(ind: Individual, inst: Instance) -> int:
@@ -177,41 +607,68 @@ def hard_penalty(ind: Individual, inst: Instance) -> int:
     return hard
 
 
-def _conflicting_indices(ind: Individual, inst: Instance) -> Set[int]:
-    bad: Set[int] = set()
-
-    occ_room: DefaultDict[Tuple[str, str], List[int]] = defaultdict(list)
-    occ_teacher: DefaultDict[Tuple[str, str], List[int]] = defaultdict(list)
-    occ_group: DefaultDict[Tuple[str, str], List[int]] = defaultdict(list)
-
-    for i, (ts_id, room_id) in enumerate(ind):
-        s = inst.sessions[i]
-        occ_room[(ts_id, room_id)].append(i)
-        occ_teacher[(ts_id, s.teacher)].append(i)
-        for g in s.groups:
-            occ_group[(ts_id, g)].append(i)
-
-        room = inst.rooms[room_id]
-        if room.capacity < s.size:
-            bad.add(i)
-        if room.rtype != s.rtype:
-            bad.add(i)
-
-        av = inst.teacher_availability.get(s.teacher)
-        if av is not None and ts_id not in av:
-            bad.add(i)
-
-    for idxs in occ_room.values():
-        if len(idxs) > 1:
-            bad.update(idxs)
-    for idxs in occ_teacher.values():
-        if len(idxs) > 1:
-            bad.update(idxs)
-    for idxs in occ_group.values():
-        if len(idxs) > 1:
-            bad.update(idxs)
-
-    return bad
+def _sample_step(
+    tracker: HardConstraintTracker,
+    idx: int,
+    ts_choices: List[str],
+    room_choices: List[str],
+    attempts_per_gene: int,
+    rng: random.Random,
+) -> None:
+    base_hard = tracker.hard()
+    old_ts, old_room = tracker.assignment(idx)
+
+    best_ts, best_room = old_ts, old_room
+    best_hard = base_hard
+
+    for _k in range(attempts_per_gene):
+        cand_ts = rng.choice(ts_choices)
+        cand_room = rng.choice(room_choices)
+        if cand_ts == old_ts and cand_room == old_room:
+            continue
+
+        h = base_hard + tracker.move_delta(idx, cand_ts, cand_room)
+        if h < best_hard:
+            best_hard = h
+            best_ts, best_room = cand_ts, cand_room
+            if best_hard == 0:
+                break
+
+    tracker.move(idx, best_ts, best_room)
+
+
+def _best_step(
+    tracker: HardConstraintTracker,
+    idx: int,
+    ts_choices: List[str],
+    room_choices: List[str],
+) -> None:
+    # Scan every (timeslot, room) candidate by delta alone; where the cell
+    # has a single occupant, also score swapping with it.
+    if isinstance(tracker, FlatHardConstraintTracker) and tracker.accelerated:
+        tracker.best_step(idx, ts_choices, room_choices)
+        return
+
+    best_delta = 0
+    best_move: Optional[Tuple[str, str]] = None
+    best_swap: Optional[int] = None
+
+    for ts in ts_choices:
+        for room_id in room_choices:
+            d = tracker.move_delta(idx, ts, room_id)
+            if d < best_delta:
+                best_delta, best_move, best_swap = d, (ts, room_id), None
+
+            other = tracker.occupant(ts, room_id)
+            if other is not None and other != idx:
+                d = tracker.swap_delta(idx, other)
+                if d < best_delta:
+                    best_delta, best_move, best_swap = d, None, other
+
+    if best_swap is not None:
+        tracker.swap(idx, best_swap)
+    elif best_move is not None:
+        tracker.move(idx, *best_move)
 
 
 def repair(
@@ -219,66 +676,75 @@ def repair(
     inst: Instance,
     attempts_per_gene: int = 20,
     max_rounds: int = 3,
+    mode: str = "sample",
+    domains: Optional[Domains] = None,
+    tracker_kind: str = "dict",
+    compiled: Optional[CompiledInstance] = None,
+    rng: Optional[random.Random] = None,
+    kernels: str = "python",
 ) -> Individual:
     """
     Repair focuses on reducing HARD penalty quickly using incremental scoring.
     It does not try to optimize SOFT penalties; GA will do that.
-    """
-    timeslot_ids = [t.id for t in inst.timeslots]
-    room_ids = list(inst.rooms.keys())
 
-    # Precompute feasibility sets to avoid wasting candidate trials
-    feasible_rooms: List[List[str]] = []
-    feasible_timeslots: List[List[str]] = []
+    mode="sample" tries `attempts_per_gene` random candidates per conflicting
+    session; mode="best" deterministically takes the best move or swap over
+    the session's whole candidate domain, scored by delta without applying.
 
-    for s in inst.sessions:
-        rs = [rid for rid in room_ids if inst.rooms[rid].capacity >=
-              s.size and inst.rooms[rid].rtype == s.rtype]
-        feasible_rooms.append(rs if rs else room_ids)
+    Candidates come from `domains`; pass them in when repairing many
+    individuals of the same instance. tracker_kind="flat" uses the array-backed
+    tracker over `compiled` (built here if not given), with `kernels` its
+    backend. All randomness comes from `rng`, so a seeded rng gives a
+    reproducible repair.
+    """
+    if mode not in REPAIR_MODES:
+        raise ValueError(f"mode must be one of {REPAIR_MODES}.")
+    if tracker_kind not in TRACKERS:
+        raise ValueError(f"tracker_kind must be one of {TRACKERS}.")
 
-        av = inst.teacher_availability.get(s.teacher)
-        feasible_timeslots.append(list(av) if av else timeslot_ids)
+    rng = rng or random.Random()
+    if domains is None:
+        domains = compute_domains(inst)
 
     out = ind[:]
-    tracker = HardConstraintTracker(out, inst)
+    if tracker_kind == "flat":
+        tracker = FlatHardConstraintTracker(out, inst, compiled, kernels=kernels)
+    else:
+        tracker = HardConstraintTracker(out, inst)
+
+    repair_in_place(tracker, domains, attempts_per_gene=attempts_per_gene,
+                    max_rounds=max_rounds, mode=mode, rng=rng)
+    return tracker.ind[:]
+
+
+def repair_in_place(
+    tracker: HardConstraintTracker,
+    domains: Domains,
+    *,
+    attempts_per_gene: int,
+    max_rounds: int,
+    mode: str,
+    rng: random.Random,
+) -> None:
+    """The repair loop of repair(), applied to an existing tracker."""
+    feasible_timeslots = domains.timeslots
+    feasible_rooms = domains.rooms
 
     for _ in range(max_rounds):
-        bad = list(_conflicting_indices(tracker.ind, inst))
+        bad = tracker.conflicts_by_weight(rng)
         if not bad:
             break
 
-        random.shuffle(bad)
-
         for idx in bad:
-            base_hard = tracker.hard()
-            old_ts, old_room = tracker.assignment(idx)
-
-            best_ts, best_room = old_ts, old_room
-            best_hard = base_hard
-
-            ts_choices = feasible_timeslots[idx]
-            room_choices = feasible_rooms[idx]
-
-            for _k in range(attempts_per_gene):
-                cand_ts = random.choice(ts_choices)
-                cand_room = random.choice(room_choices)
-                if cand_ts == old_ts and cand_room == old_room:
-                    continue
-
-                token = tracker.move(idx, cand_ts, cand_room)
-                h = tracker.hard()
-                if h < best_hard:
-                    best_hard = h
-                    best_ts, best_room = cand_ts, cand_room
-                    tracker.undo(token)
-                    if best_hard == 0:
-                        break
-                else:
-                    tracker.undo(token)
-
-            tracker.move(idx, best_ts, best_room)
+            if tracker.violation(idx) == 0:
+                continue  # fixed as a side effect of an earlier move
 
-            if tracker.hard() == 0:
-                return tracker.ind[:]
+            if mode == "best":
+                _best_step(tracker, idx,
+                           feasible_timeslots[idx], feasible_rooms[idx])
+            else:
+                _sample_step(tracker, idx, feasible_timeslots[idx],
+                             feasible_rooms[idx], attempts_per_gene, rng)
 
-    return tracker.ind[:]
+            if tracker.hard() == 0:
+                return
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from timetable.models import Instance, Individual
+
+_INF = float("inf")
+
+
+def compatible_rooms(inst: Instance) -> List[List[str]]:
+    """Per session: rooms with the right type and enough capacity, tightest first."""
+    by_cap = sorted(inst.rooms.values(), key=lambda r: (r.capacity, r.id))
+    return [[r.id for r in by_cap if r.capacity >= s.size and r.rtype == s.rtype]
+            for s in inst.sessions]
+
+
+def _hopcroft_karp(adj: Sequence[Sequence[int]], n_right: int) -> List[int]:
+    """Maximum bipartite matching; returns match[left] = right or -1."""
+    n_left = len(adj)
+    match_l = [-1] * n_left
+    match_r = [-1] * n_right
+    dist = [0.0] * n_left
+
+    def bfs() -> bool:
+        q = deque()
+        for u in range(n_left):
+            if match_l[u] == -1:
+                dist[u] = 0
+                q.append(u)
+            else:
+                dist[u] = _INF
+        found = False
+        while q:
+            u = q.popleft()
+            for v in adj[u]:
+                w = match_r[v]
+                if w == -1:
+                    found = True
+                elif dist[w] == _INF:
+                    dist[w] = dist[u] + 1
+                    q.append(w)
+        return found
+
+    def dfs(u: int) -> bool:
+        for v in adj[u]:
+            w = match_r[v]
+            if w == -1 or (dist[w] == dist[u] + 1 and dfs(w)):
+                match_l[u] = v
+                match_r[v] = u
+                return True
+        dist[u] = _INF
+        return False
+
+    while bfs():
+        for u in range(n_left):
+            if match_l[u] == -1:
+                dfs(u)
+
+    return match_l
+
+
+def assign_rooms(
+    ind: Individual,
+    inst: Instance,
+    compat: Optional[List[List[str]]] = None,
+) -> Individual:
+    """
+    Keep every session's timeslot and choose rooms per timeslot with a
+    maximum matching over capacity/type-compatible rooms. Sessions left
+    unmatched take the room with the fewest violations, counting a
+    collision with an already used room as one.
+    """
+    if compat is None:
+        compat = compatible_rooms(inst)
+
+    room_ids = list(inst.rooms.keys())
+    room_pos = {rid: k for k, rid in enumerate(room_ids)}
+
+    by_ts: Dict[str, List[int]] = {}
+    for i, (ts_id, _) in enumerate(ind):
+        by_ts.setdefault(ts_id, []).append(i)
+
+    out = ind[:]
+    for ts_id, idxs in by_ts.items():
+        adj = [[room_pos[rid] for rid in compat[i]] for i in idxs]
+        match = _hopcroft_karp(adj, len(room_ids))
+
+        used = set()
+        unmatched: List[int] = []
+        for i, r in zip(idxs, match):
+            if r == -1:
+                unmatched.append(i)
+            else:
+                out[i] = (ts_id, room_ids[r])
+                used.add(room_ids[r])
+
+        for i in unmatched:
+            s = inst.sessions[i]
+
+            def cost(rid: str):
+                room = inst.rooms[rid]
+                c = (room.capacity < s.size) + (room.rtype != s.rtype) + (rid in used)
+                return (c, room.capacity)
+
+            rid = min(room_ids, key=cost)
+            out[i] = (ts_id, rid)
+            used.add(rid)
+
+    return out
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import itertools
+import math
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from timetable.models import Instance, Individual, Penalty
+from timetable.ga import GAConfig, HistoryRow, check_config, derive_seed, make_pool, solve
+
+SweepRow = Tuple[int, int, int, int, int]  # (rung, variant, total, hard, soft)
+SweepProgressCb = Callable[[SweepRow], None]
+
+
+@dataclass(frozen=True)
+class SweepEntry:
+    variant: int
+    config: GAConfig
+    best: Individual
+    penalty: Penalty
+    history: List[HistoryRow]
+    generations_run: int
+    pruned_at: Optional[int]  # rung index, None if the variant survived
+
+
+def expand_grid(base: Dict[str, Any], grid: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """One config per combination of the grid axes, each over a copy of `base`."""
+    keys = sorted(grid)
+    for k in keys:
+        if not isinstance(grid[k], list) or not grid[k]:
+            raise ValueError(f"Grid axis '{k}' must be a non-empty list.")
+
+    return [{**base, **dict(zip(keys, combo))}
+            for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def check_sweep(variants: Sequence[GAConfig], min_generations: int, eta: int,
+                workers: int) -> None:
+    """Raises ValueError for arguments sweep() would reject."""
+    if not variants:
+        raise ValueError("variants must not be empty.")
+    if min_generations <= 0:
+        raise ValueError("min_generations must be > 0.")
+    if eta < 2:
+        raise ValueError("eta must be >= 2.")
+    if workers <= 0:
+        raise ValueError("workers must be >= 1.")
+    for k, v in enumerate(variants):
+        try:
+            check_config(replace(v, workers=workers, log_every=0))
+        except ValueError as e:
+            raise ValueError(f"Variant {k}: {e}")
+
+
+def sweep(
+    inst: Instance,
+    variants: Sequence[GAConfig],
+    *,
+    min_generations: int = 25,
+    eta: int = 2,
+    workers: int = 1,
+    progress_cb: Optional[SweepProgressCb] = None,
+) -> List[SweepEntry]:
+    """
+    Successive halving over GA configurations: every variant gets a short
+    budget, the best 1/eta survive to a budget eta times larger, until one
+    variant is left; that one is then run with its own `generations`.
+    Survivors resume from their last population, so a rung only pays for
+    the generations it adds.
+
+    All runs share one worker pool, so the instance is shipped to the
+    workers once for the whole sweep. Returns entries ranked best first.
+    """
+    check_sweep(variants, min_generations, eta, workers)
+
+    # every run in the sweep goes through the shared pool
+    configs = [replace(v, workers=workers, log_every=0) for v in variants]
+    entries: Dict[int, SweepEntry] = {}
+    populations: Dict[int, List[Individual]] = {}
+
+    pool = make_pool(inst, workers) if workers > 1 else None
+    try:
+        alive = list(range(len(configs)))
+        budget = min_generations
+        rung = 0
+
+        while True:
+            for v in alive:
+                cfg = configs[v]
+                gens = min(budget, variants[v].generations)
+                prev = entries.get(v)
+                ran = prev.generations_run if prev is not None else 0
+                if ran >= gens:
+                    continue
+
+                # a resumed run draws fresh streams, not a replay of rung 0's
+                seed = cfg.seed if prev is None else derive_seed(cfg.seed, "rung", rung)
+                best, pen, hist = solve(
+                    inst, replace(cfg, generations=gens - ran, seed=seed), pool=pool,
+                    seeds=populations.get(v), population_cb=partial(populations.__setitem__, v))
+                if prev is not None:
+                    # generation 0 of a resumed run re-scores the population it resumed from
+                    hist = prev.history + [(g + ran, *row) for g, *row in hist[1:]]
+                    if prev.penalty.total < pen.total:
+                        best, pen = prev.best, prev.penalty
+                entries[v] = SweepEntry(
+                    variant=v, config=variants[v], best=best, penalty=pen,
+                    history=hist, generations_run=gens, pruned_at=None)
+
+                if progress_cb is not None:
+                    progress_cb((rung, v, pen.total, pen.hard, pen.soft))
+
+            alive.sort(key=lambda v: entries[v].penalty.total)
+            done = all(entries[v].generations_run >= variants[v].generations
+                       for v in alive)
+            if done:
+                break
+
+            if len(alive) > 1:
+                keep = max(1, math.ceil(len(alive) / eta))
+                for v in alive[keep:]:
+                    entries[v] = replace(entries[v], pruned_at=rung)
+                    del populations[v]
+                alive = alive[:keep]
+                budget *= eta
+            else:
+                # the winner gets its full budget
+                budget = variants[alive[0]].generations
+            rung += 1
+
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # survivors first, then by how far a variant got, then by penalty
+    def rank_key(e: SweepEntry):
+        depth = math.inf if e.pruned_at is None else e.pruned_at
+        return (-depth, e.penalty.total)
+
+    return sorted(entries.values(), key=rank_key)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from timetable.models import Instance, Session
+
+
+def sibling_key(s: Session) -> Tuple:
+    """Sessions with equal keys are interchangeable: same course, teacher, groups, size and type."""
+    return (s.course, s.teacher, s.groups, s.size, s.rtype)
+
+
+@dataclass(frozen=True)
+class Symmetry:
+    """
+    Interchangeable sibling sessions (the `sessions_per_week` copies of a
+    course). Permuting assignments among siblings never changes the
+    penalty, so every such permutation is folded onto one canonical block:
+    within each class, (timeslot, room) pairs in ascending order.
+    """
+    class_of: np.ndarray  # (sessions,) class index, numbered by first appearance
+    slots: np.ndarray     # session indices grouped by class, ascending within a class
+
+    @classmethod
+    def build(cls, inst: Instance) -> "Symmetry":
+        ids: Dict[Tuple, int] = {}
+        class_of = np.array([ids.setdefault(sibling_key(s), len(ids)) for s in inst.sessions],
+                            dtype=np.intp)
+        return cls(class_of, np.argsort(class_of, kind="stable"))
+
+    def canonicalize(self, block: np.ndarray) -> np.ndarray:
+        """Sorts each class's (timeslot, room) pairs in place; returns `block`."""
+        order = np.lexsort((block[1], block[0], self.class_of))
+        block[:, self.slots] = block[:, order]
+        return block
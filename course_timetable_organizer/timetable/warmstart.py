@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from timetable.models import Assignment, Instance, Individual
+
+
+def warm_start_individual(
+    inst: Instance,
+    previous: Mapping[str, Assignment],
+    rng: Optional[random.Random] = None,
+) -> Tuple[Individual, List[int]]:
+    """
+    Map a previous timetable (session id -> (timeslot, room)) onto `inst`.
+
+    Sessions keep their old assignment unless they are new, or their old
+    timeslot/room no longer exists, or the assignment became infeasible
+    (teacher no longer available, room too small or of the wrong type).
+    Only those sessions are re-randomized; their indices are returned so
+    callers can report how much of the old solution survived.
+    """
+    rng = rng or random.Random()
+
+    timeslot_ids = [t.id for t in inst.timeslots]
+    ts_known = set(timeslot_ids)
+    room_ids = list(inst.rooms.keys())
+
+    ind: Individual = []
+    changed: List[int] = []
+
+    for i, s in enumerate(inst.sessions):
+        av = inst.teacher_availability.get(s.teacher)
+        prev = previous.get(s.id)
+
+        if prev is not None:
+            ts_id, room_id = prev
+            room = inst.rooms.get(room_id)
+            if (
+                ts_id in ts_known
+                and room is not None
+                and room.capacity >= s.size
+                and room.rtype == s.rtype
+                and (av is None or ts_id in av)
+            ):
+                ind.append((ts_id, room_id))
+                continue
+
+        rs = [rid for rid in room_ids if inst.rooms[rid].capacity >=
+              s.size and inst.rooms[rid].rtype == s.rtype]
+        ts_choices = sorted(av & ts_known) if av else timeslot_ids
+        ind.append((rng.choice(ts_choices or timeslot_ids),
+                    rng.choice(rs or room_ids)))
+        changed.append(i)
+
+    return ind, changed
+
+
+def assignments_from_rows(rows: List[Dict]) -> Dict[str, Assignment]:
+    return {r["session_id"]: (r["timeslot_id"], r["room"]) for r in rows}